@@ -12,22 +12,53 @@ __desc__ = "YouTube Music plugin"
 
 
 ui_mgr = None
+media_failed_receiver = None
 
 
 def init_config(config):
     # For example: http://127.0.0.1:7890. This will be used in API and media accessing.
     config.deffield("HTTP_PROXY", type_=str, default="", desc="YouTube Music HTTP proxy")
     config.deffield("HTTP_TIMEOUT", type_=int, default=2, desc="HTTP requests timeout")
+    config.deffield(
+        "HTTP_POOL_SIZE",
+        type_=int,
+        default=16,
+        desc="Connections kept open to music.youtube.com (at most, over HTTP/2)",
+    )
+    config.deffield(
+        "HTTP2",
+        type_=bool,
+        default=False,
+        desc="Multiplex API calls over HTTP/2 (needs fuo-ytmusic[http2])",
+    )
+    config.deffield(
+        "HTTP_METRICS",
+        type_=bool,
+        default=False,
+        desc="Record request latencies and errors for the metrics dialog",
+    )
     config.deffield(
         "LANGUAGE",
         type_=str,
         default="auto",
         desc="YouTube Music language (auto to follow system)",
     )
+    config.deffield(
+        "DISK_CACHE",
+        type_=bool,
+        default=True,
+        desc="Cache API responses on disk to speed up startup",
+    )
+    config.deffield(
+        "LIBRARY_INDEX",
+        type_=bool,
+        default=False,
+        desc="Sync the library to a local index for offline library search",
+    )
 
 
 def enable(app: "App"):
-    global ui_mgr
+    global ui_mgr, media_failed_receiver
 
     from fuo_ytmusic.provider import provider
 
@@ -40,8 +71,32 @@ def enable(app: "App"):
 
     provider.setup_http_proxy(config_http_proxy)
     provider.setup_http_timeout(app.config.ytmusic.HTTP_TIMEOUT)
+    provider.setup_http_pool(app.config.ytmusic.HTTP_POOL_SIZE)
+    if app.config.ytmusic.HTTP2:
+        provider.setup_http2(True)
+    if app.config.ytmusic.HTTP_METRICS:
+        provider.setup_http_metrics(True)
     provider.setup_language(resolve_language(app, app.config.ytmusic.LANGUAGE))
+    if app.config.ytmusic.DISK_CACHE:
+        from fuo_ytmusic.consts import METADATA_CACHE_FILE
+
+        provider.setup_disk_cache(METADATA_CACHE_FILE)
+    if app.config.ytmusic.LIBRARY_INDEX:
+        from fuo_ytmusic.consts import LIBRARY_INDEX_FILE
+
+        provider.setup_library_index(LIBRARY_INDEX_FILE)
     app.library.register(provider)
+
+    # A stream url may expire or be revoked while its media is cached.
+    def on_media_loading_failed():
+        media = app.player.current_media
+        if media is not None:
+            provider.media_loading_failed(media)
+
+    media_failed_receiver = on_media_loading_failed
+    app.player.media_loading_failed.connect(
+        media_failed_receiver, weak=False, aioqueue=True
+    )
     if app.mode & app.GuiMode:
         from .provider_ui import ProviderUI
 
@@ -50,8 +105,11 @@ def enable(app: "App"):
 
 
 def disable(app: "App"):
-    global ui_mgr
+    global ui_mgr, media_failed_receiver
 
+    if media_failed_receiver is not None:
+        app.player.media_loading_failed.disconnect(media_failed_receiver)
+        media_failed_receiver = None
     provider = app.library.get("ytmusic")
     if provider is not None:
         app.library.deregister(provider)
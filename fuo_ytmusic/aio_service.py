@@ -0,0 +1,131 @@
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import List, Optional
+
+from fuo_ytmusic.models import (
+    AlbumInfo,
+    ArtistInfo,
+    ArtistPage,
+    Categories,
+    PlaylistInfo,
+    PlaylistNestedResult,
+    YtmusicLibraryArtist,
+    YtmusicLibrarySong,
+    YtmusicSearchAlbum,
+)
+from fuo_ytmusic.service import (
+    GLOBAL_LIMIT,
+    YtmusicScope,
+    YtmusicService,
+    YtmusicType,
+)
+
+
+class AsyncYtmusicService:
+    """asyncio flavored YtmusicService.
+
+    ytmusicapi is built on `requests`, so the blocking calls run on an
+    executor owned by this object rather than on the loop's default one.
+    Page loads therefore do not exhaust the default executor, which
+    aio.run_fn and friends share with the rest of the application. Calls
+    beyond `max_workers` wait in the executor queue.
+    """
+
+    def __init__(self, service: Optional[YtmusicService] = None, max_workers: int = 8):
+        self._service = service or YtmusicService()
+        self._max_workers = max_workers
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    @property
+    def service(self) -> YtmusicService:
+        return self._service
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(
+                        max_workers=self._max_workers,
+                        thread_name_prefix="ytmusic-aio",
+                    )
+        return self._executor
+
+    async def _run(self, func, *args, **kwargs):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._get_executor(), partial(func, *args, **kwargs)
+        )
+
+    def shutdown(self):
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False)
+
+    async def search(
+        self,
+        keywords: str,
+        t: Optional[YtmusicType],
+        scope: YtmusicScope = None,
+        page_size: int = GLOBAL_LIMIT,
+    ) -> list:
+        return await self._run(self._service.search, keywords, t, scope, page_size)
+
+    async def home_sections(self, limit: int = 12) -> list:
+        return await self._run(self._service.home_sections, limit)
+
+    async def artist_info(self, channel_id: str) -> ArtistInfo:
+        return await self._run(self._service.artist_info, channel_id)
+
+    async def artist_page(self, channel_id: str) -> ArtistPage:
+        return await self._run(self._service.artist_page, channel_id)
+
+    async def album_info(self, browse_id: str) -> AlbumInfo:
+        return await self._run(self._service.album_info, browse_id)
+
+    async def playlist_info(
+        self, playlist_id: str, limit: int = GLOBAL_LIMIT
+    ) -> PlaylistInfo:
+        return await self._run(self._service.playlist_info, playlist_id, limit)
+
+    async def playlist_tracks_page(self, playlist_id: str, continuation=None):
+        return await self._run(
+            self._service.playlist_tracks_page, playlist_id, continuation
+        )
+
+    async def categories(self) -> List[Categories]:
+        return await self._run(self._service.categories)
+
+    async def category_playlists(self, params: str) -> List[PlaylistNestedResult]:
+        return await self._run(self._service.category_playlists, params)
+
+    async def library_playlists(
+        self, limit: int = GLOBAL_LIMIT
+    ) -> List[PlaylistNestedResult]:
+        return await self._run(self._service.library_playlists, limit)
+
+    async def library_songs(
+        self, limit: int = GLOBAL_LIMIT
+    ) -> List[YtmusicLibrarySong]:
+        return await self._run(self._service.library_songs, limit)
+
+    async def library_albums(
+        self, limit: int = GLOBAL_LIMIT
+    ) -> List[YtmusicSearchAlbum]:
+        return await self._run(self._service.library_albums, limit)
+
+    async def library_artists(
+        self, limit: int = GLOBAL_LIMIT
+    ) -> List[YtmusicLibraryArtist]:
+        return await self._run(self._service.library_artists, limit)
+
+    async def library_subscription_artists(
+        self, limit: int = GLOBAL_LIMIT
+    ) -> List[YtmusicLibraryArtist]:
+        return await self._run(self._service.library_subscription_artists, limit)
+
+    async def liked_songs(self, limit: int = GLOBAL_LIMIT) -> PlaylistInfo:
+        return await self._run(self._service.liked_songs, limit)
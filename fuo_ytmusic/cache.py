@@ -0,0 +1,187 @@
+import inspect
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from functools import partial, wraps
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+
+class LruTtlCache:
+    """Thread-safe LRU cache whose entries also expire after `ttl` seconds."""
+
+    def __init__(self, maxsize: int, ttl: float, timer: Callable[[], float] = None):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._timer = timer or time.monotonic
+        # key -> (expires_at, value), ordered from least to most recently used.
+        self._data: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: Hashable) -> Tuple[Any, bool]:
+        """Return (value, exist), similar to feeluown's model cache_get."""
+        with self._lock:
+            item = self._data.get(key)
+            if item is not None:
+                expires_at, value = item
+                if expires_at > self._timer():
+                    self._data.move_to_end(key)
+                    self.hits += 1
+                    return value, True
+                del self._data[key]
+            self.misses += 1
+            return None, False
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None):
+        """Store value; `ttl` overrides the default ttl for this entry."""
+        ttl = self.ttl if ttl is None else ttl
+        with self._lock:
+            self._data[key] = (self._timer() + ttl, value)
+            self._data.move_to_end(key)
+            self._evict()
+
+    def pop(self, key: Hashable):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def pop_where(self, predicate: Callable[[Any], bool]) -> int:
+        """Remove entries whose value matches predicate; return the count."""
+        with self._lock:
+            keys = [k for k, (_, value) in self._data.items() if predicate(value)]
+            for key in keys:
+                del self._data[key]
+            return len(keys)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def configure(self, maxsize: Optional[int] = None, ttl: Optional[float] = None):
+        with self._lock:
+            if maxsize is not None:
+                self.maxsize = maxsize
+            if ttl is not None:
+                self.ttl = ttl
+            self._evict()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "size": len(self._data),
+                "maxsize": self.maxsize,
+                "ttl": self.ttl,
+            }
+
+    def __len__(self):
+        return len(self._data)
+
+    def _evict(self):
+        while len(self._data) > max(self.maxsize, 0):
+            self._data.popitem(last=False)
+            self.evictions += 1
+
+
+class SingleFlight:
+    """Share one call among the concurrent callers of the same key.
+
+    The first caller of a key runs the function; callers arriving while it
+    runs wait for it and receive the same result, or the same exception.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: Dict[Hashable, Future] = {}
+
+    def do(self, key: Hashable, func: Callable[[], Any]) -> Any:
+        with self._lock:
+            future = self._calls.get(key)
+            leader = future is None
+            if leader:
+                future = self._calls[key] = Future()
+        if not leader:
+            return future.result()
+        try:
+            value = func()
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(value)
+            return value
+        finally:
+            with self._lock:
+                del self._calls[key]
+
+    def __len__(self):
+        return len(self._calls)
+
+
+def _scoped_key(self, args, kwargs):
+    return (self._cache_scope(), args, tuple(sorted(kwargs.items())))
+
+
+def single_flight(func):
+    """Share a YtmusicService method call among concurrent identical calls.
+
+    Calls are identified like `scoped_cache` does, by (scope, arguments).
+    Nothing is kept once the call returns; use `scoped_cache` for that.
+    """
+    flight = SingleFlight()
+
+    @wraps(func)
+    def wrapper(self, *args, **kwargs):
+        key = _scoped_key(self, args, kwargs)
+        return flight.do(key, partial(func, self, *args, **kwargs))
+
+    wrapper.flight = flight
+    return wrapper
+
+
+def scoped_cache(maxsize: int, ttl: float):
+    """Cache a YtmusicService method by (scope, arguments).
+
+    The scope is returned by ``self._cache_scope()``, so a response fetched
+    for one language or profile is never served to another one. Concurrent
+    misses of the same key share one call, see `SingleFlight`. Like
+    cachetools' decorators, the wrapper exposes `cache_clear`. `cache_key`
+    returns the key of a call, e.g. to `cache.pop` a single entry.
+    """
+
+    def decorator(func):
+        cache = LruTtlCache(maxsize, ttl)
+        flight = SingleFlight()
+        signature = inspect.signature(func)
+
+        def cache_key(self, *args, **kwargs):
+            # Bind defaults, so that f() and f(default) share one entry.
+            bound = signature.bind(self, *args, **kwargs)
+            bound.apply_defaults()
+            return self._cache_scope(), tuple(bound.arguments.values())[1:]
+
+        @wraps(func)
+        def wrapper(self, *args, **kwargs):
+            key = cache_key(self, *args, **kwargs)
+            value, exist = cache.get(key)
+            if exist:
+                return value
+
+            def load():
+                value = func(self, *args, **kwargs)
+                cache.set(key, value)
+                return value
+
+            return flight.do(key, load)
+
+        wrapper.cache = cache
+        wrapper.flight = flight
+        wrapper.cache_clear = cache.clear
+        wrapper.cache_key = cache_key
+        return wrapper
+
+    return decorator
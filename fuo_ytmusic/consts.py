@@ -1,6 +1,10 @@
 from pathlib import Path
 from feeluown.consts import DATA_DIR
 HEADER_FILE = Path(DATA_DIR) / "ytmusic_header.json"
+# Raw API payloads are cached here, so the first screen renders from disk.
+METADATA_CACHE_FILE = Path(DATA_DIR) / "ytmusic_cache.sqlite3"
+# Local copy of the user's library, used by offline library search.
+LIBRARY_INDEX_FILE = Path(DATA_DIR) / "ytmusic_library.sqlite3"
 REQUIRED_COOKIE_FIELDS = [
     "HSID",
     "SSID",
@@ -0,0 +1,81 @@
+import json
+import logging
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class YtmusicDiskCache:
+    """Persist raw ytmusicapi payloads in a SQLite file.
+
+    Entries are never considered invalid here; the caller decides whether
+    an entry is fresh enough by looking at the time it was stored.
+    """
+
+    def __init__(self, path: Path):
+        self._path = Path(path)
+        self._lock = threading.Lock()
+        self._path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self._path), check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS payloads ("
+                "key TEXT PRIMARY KEY, payload TEXT NOT NULL, stored_at REAL NOT NULL)"
+            )
+
+    @property
+    def path(self) -> Path:
+        return self._path
+
+    def get(self, key: str) -> Optional[Tuple[Any, float]]:
+        """Return (payload, stored_at), or None when key is not cached."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT payload, stored_at FROM payloads WHERE key = ?", (key,)
+            ).fetchone()
+        if row is None:
+            return None
+        try:
+            return json.loads(row[0]), row[1]
+        except ValueError:
+            logger.warning("drop corrupted ytmusic disk cache entry: %s", key)
+            self.delete(key)
+            return None
+
+    def set(self, key: str, payload: Any, stored_at: Optional[float] = None) -> bool:
+        try:
+            text = json.dumps(payload, ensure_ascii=False)
+        except (TypeError, ValueError) as e:
+            logger.debug("skip caching unserializable payload(%s): %s", key, e)
+            return False
+        stored_at = time.time() if stored_at is None else stored_at
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO payloads (key, payload, stored_at) "
+                "VALUES (?, ?, ?)",
+                (key, text, stored_at),
+            )
+        return True
+
+    def delete(self, key: str):
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM payloads WHERE key = ?", (key,))
+
+    def purge(self, older_than: float):
+        """Remove entries stored before the `older_than` timestamp."""
+        with self._lock, self._conn:
+            self._conn.execute(
+                "DELETE FROM payloads WHERE stored_at < ?", (older_than,)
+            )
+
+    def clear(self):
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM payloads")
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
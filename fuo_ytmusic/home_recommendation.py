@@ -40,48 +40,51 @@ class YtmusicHomeRecommendationBuilder:
     def build_collections(self, sections: Sequence[dict]) -> List[Collection]:
         collections: List[Collection] = []
         for section in sections or []:
-            if not isinstance(section, dict):
-                continue
-            contents = section.get("contents")
-            if not isinstance(contents, list):
-                continue
+            collections.extend(self.build_section_collections(section))
+        return collections
 
-            section_title = section.get("title") or self.DEFAULT_SECTION_TITLE
-            typed_collections = self._build_typed_collections(contents)
-            if not typed_collections:
-                continue
-            if len(typed_collections) == 1:
-                section_type, models = typed_collections[0]
-                collections.append(
-                    Collection(name=section_title, type_=section_type, models=models)
-                )
-                continue
-            for section_type, models in typed_collections:
-                suffix = self.TYPE_TITLE_SUFFIXES[section_type]
-                collections.append(
-                    Collection(
-                        name=f"{section_title} · {suffix}",
-                        type_=section_type,
-                        models=models,
-                    )
+    def build_section_collections(self, section: dict) -> List[Collection]:
+        """Build the collections of one home section, one per item type."""
+        if not isinstance(section, dict):
+            return []
+        contents = section.get("contents")
+        if not isinstance(contents, list):
+            return []
+
+        section_title = section.get("title") or self.DEFAULT_SECTION_TITLE
+        typed_collections = self._build_typed_collections(contents)
+        if len(typed_collections) == 1:
+            section_type, models = typed_collections[0]
+            return [Collection(name=section_title, type_=section_type, models=models)]
+        collections = []
+        for section_type, models in typed_collections:
+            suffix = self.TYPE_TITLE_SUFFIXES[section_type]
+            collections.append(
+                Collection(
+                    name=f"{section_title} · {suffix}",
+                    type_=section_type,
+                    models=models,
                 )
+            )
         return collections
 
     def _build_typed_collections(
         self, contents: Sequence[dict]
     ) -> List[Tuple[CollectionType, list]]:
-        type_builder_pairs = [
-            (CollectionType.only_songs, self._build_home_songs),
-            (CollectionType.only_playlists, self._build_home_playlists),
-            (CollectionType.only_albums, self._build_home_albums),
-            (CollectionType.only_videos, self._build_home_videos),
+        # Classify each item once and build it into the bucket of its type.
+        buckets = {section_type: [] for section_type in self.TYPE_ITEM_BUILDERS}
+        seen = {section_type: set() for section_type in self.TYPE_ITEM_BUILDERS}
+        for content in self._iter_valid_contents(contents):
+            section_type = self._detect_home_item_type(content)
+            if section_type is None:
+                continue
+            build = self.TYPE_ITEM_BUILDERS[section_type]
+            model = build(self, content, seen[section_type])
+            if model is not None:
+                buckets[section_type].append(model)
+        return [
+            (section_type, models) for section_type, models in buckets.items() if models
         ]
-        collections = []
-        for section_type, builder in type_builder_pairs:
-            models = builder(contents)
-            if models:
-                collections.append((section_type, models))
-        return collections
 
     @staticmethod
     def _iter_valid_contents(contents: Sequence[dict]):
@@ -115,89 +118,71 @@ class YtmusicHomeRecommendationBuilder:
             return CollectionType.only_albums
         return None
 
-    def _build_home_songs(self, contents: Sequence[dict]) -> List[BriefSongModel]:
-        songs: List[BriefSongModel] = []
-        seen_video_ids = set()
-        for content in self._iter_valid_contents(contents):
-            if self._detect_home_item_type(content) != CollectionType.only_songs:
-                continue
-            video_id = content.get("videoId")
-            if not video_id or video_id in seen_video_ids:
-                continue
-            try:
-                song = YtmusicHomeSong(**content).v2_brief_model()
-            except Exception as e:
-                logger.warning("skip invalid home song item(%s): %s", video_id, e)
-                continue
-            if not song.identifier:
-                continue
-            seen_video_ids.add(song.identifier)
-            songs.append(song)
-        return songs
-
-    def _build_home_playlists(self, contents: Sequence[dict]) -> List[PlaylistModel]:
-        playlists: List[PlaylistModel] = []
-        seen_playlist_ids = set()
-        for content in self._iter_valid_contents(contents):
-            if self._detect_home_item_type(content) != CollectionType.only_playlists:
-                continue
-            playlist_id = content.get("playlistId")
-            if not playlist_id or playlist_id in seen_playlist_ids:
-                continue
-            try:
-                playlist = YtmusicHomePlaylist(**content).v2_model()
-            except Exception as e:
-                logger.warning("skip invalid home playlist item(%s): %s", playlist_id, e)
-                continue
-            if not playlist.identifier:
-                continue
-            seen_playlist_ids.add(playlist.identifier)
-            playlists.append(playlist)
-        return playlists
-
-    def _build_home_albums(self, contents: Sequence[dict]) -> List[BriefAlbumModel]:
-        albums: List[BriefAlbumModel] = []
-        seen_browse_ids = set()
-        for content in self._iter_valid_contents(contents):
-            if self._detect_home_item_type(content) != CollectionType.only_albums:
-                continue
-            browse_id = content.get("browseId")
-            if not browse_id or browse_id in seen_browse_ids:
-                continue
-            try:
-                album = YtmusicSearchAlbum(**content).v2_brief_model()
-            except Exception as e:
-                logger.warning("skip invalid home album item(%s): %s", browse_id, e)
-                continue
-            if not album.identifier:
-                continue
-            seen_browse_ids.add(album.identifier)
-            albums.append(album)
-        return albums
-
-    def _build_home_videos(self, contents: Sequence[dict]) -> List[BriefVideoModel]:
-        videos: List[BriefVideoModel] = []
-        seen_video_ids = set()
-        for content in self._iter_valid_contents(contents):
-            if self._detect_home_item_type(content) != CollectionType.only_videos:
-                continue
-            video_id = content.get("videoId")
-            if not video_id or video_id in seen_video_ids:
-                continue
-            artists = content.get("artists")
-            artists_name = " / ".join(
-                artist.get("name", "")
-                for artist in (artists or [])
-                if isinstance(artist, dict) and artist.get("name")
-            )
-            videos.append(
-                BriefVideoModel(
-                    identifier=video_id,
-                    source=self._source,
-                    title=content.get("title") or "",
-                    artists_name=artists_name,
-                    duration_ms=content.get("duration") or "",
-                )
-            )
-            seen_video_ids.add(video_id)
-        return videos
+    def _build_home_song(self, content: dict, seen: set) -> Optional[BriefSongModel]:
+        video_id = content.get("videoId")
+        if not video_id or video_id in seen:
+            return None
+        try:
+            song = YtmusicHomeSong(**content).v2_brief_model()
+        except Exception as e:
+            logger.warning("skip invalid home song item(%s): %s", video_id, e)
+            return None
+        if not song.identifier:
+            return None
+        seen.add(song.identifier)
+        return song
+
+    def _build_home_playlist(self, content: dict, seen: set) -> Optional[PlaylistModel]:
+        playlist_id = content.get("playlistId")
+        if not playlist_id or playlist_id in seen:
+            return None
+        try:
+            playlist = YtmusicHomePlaylist(**content).v2_model()
+        except Exception as e:
+            logger.warning("skip invalid home playlist item(%s): %s", playlist_id, e)
+            return None
+        if not playlist.identifier:
+            return None
+        seen.add(playlist.identifier)
+        return playlist
+
+    def _build_home_album(self, content: dict, seen: set) -> Optional[BriefAlbumModel]:
+        browse_id = content.get("browseId")
+        if not browse_id or browse_id in seen:
+            return None
+        try:
+            album = YtmusicSearchAlbum(**content).v2_brief_model()
+        except Exception as e:
+            logger.warning("skip invalid home album item(%s): %s", browse_id, e)
+            return None
+        if not album.identifier:
+            return None
+        seen.add(album.identifier)
+        return album
+
+    def _build_home_video(self, content: dict, seen: set) -> Optional[BriefVideoModel]:
+        video_id = content.get("videoId")
+        if not video_id or video_id in seen:
+            return None
+        artists = content.get("artists")
+        artists_name = " / ".join(
+            artist.get("name", "")
+            for artist in (artists or [])
+            if isinstance(artist, dict) and artist.get("name")
+        )
+        seen.add(video_id)
+        return BriefVideoModel(
+            identifier=video_id,
+            source=self._source,
+            title=content.get("title") or "",
+            artists_name=artists_name,
+            duration_ms=content.get("duration") or "",
+        )
+
+    # Collections of a mixed section are listed in this order.
+    TYPE_ITEM_BUILDERS = {
+        CollectionType.only_songs: _build_home_song,
+        CollectionType.only_playlists: _build_home_playlist,
+        CollectionType.only_albums: _build_home_album,
+        CollectionType.only_videos: _build_home_video,
+    }
@@ -0,0 +1,166 @@
+"""HTTP/2 transport for InnerTube calls.
+
+Browse, next and search calls which the GUI issues at the same time are
+multiplexed over one connection to music.youtube.com, instead of each one
+taking a connection of the HTTP/1.1 pool. The transport is built on httpx,
+which is an optional dependency::
+
+    pip install 'fuo-ytmusic[http2]'
+"""
+
+import importlib.util
+import threading
+import time
+from datetime import timedelta
+from typing import Dict, Optional, Tuple
+
+import requests
+from requests.adapters import BaseAdapter
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers, select_proxy
+
+try:
+    import httpx
+except ImportError:
+    httpx = None
+
+# One HTTP/2 connection carries many concurrent streams, more connections are
+# only opened when the server limits the streams. YtmusicSession passes the
+# pool size of the host instead.
+MAX_CONNECTIONS = 2
+# httpx only retries failures to connect, which are safe for any method.
+CONNECT_RETRIES = 2
+# requests adds these by default, but HTTP/2 forbids connection-specific headers.
+HOP_BY_HOP_HEADERS = frozenset(
+    ["connection", "keep-alive", "proxy-connection", "transfer-encoding", "upgrade"]
+)
+
+
+def http2_available() -> bool:
+    return httpx is not None and importlib.util.find_spec("h2") is not None
+
+
+class YtmusicHTTP2Adapter(BaseAdapter):
+    """requests adapter which sends requests through an HTTP/2 httpx client.
+
+    ytmusicapi only talks to requests, so the adapter converts requests'
+    PreparedRequest to httpx and the httpx response back. The body is read
+    completely, like requests does when `stream` is False.
+    """
+
+    def __init__(self, max_connections: int = MAX_CONNECTIONS):
+        if not http2_available():
+            raise ImportError(
+                "HTTP/2 transport requires httpx and h2, "
+                "install them with: pip install 'fuo-ytmusic[http2]'"
+            )
+        super().__init__()
+        self.max_connections = max_connections
+        self._clients: Dict[Tuple[Optional[str], object], "httpx.Client"] = {}
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.http_versions: Dict[str, int] = {}
+
+    def send(
+        self, request, stream=False, timeout=None, verify=True, cert=None, proxies=None
+    ):
+        client = self._get_client(select_proxy(request.url, proxies), verify)
+        h_request = httpx.Request(
+            request.method,
+            request.url,
+            headers=[
+                (name, value)
+                for name, value in request.headers.items()
+                if name.lower() not in HOP_BY_HOP_HEADERS
+            ],
+            content=request.body,
+            extensions={"timeout": _to_httpx_timeout(timeout).as_dict()},
+        )
+        start = time.perf_counter()
+        try:
+            h_response = client.send(h_request)
+        except httpx.ConnectTimeout as e:
+            raise requests.ConnectTimeout(e, request=request)
+        except httpx.TimeoutException as e:
+            raise requests.ReadTimeout(e, request=request)
+        except httpx.TransportError as e:
+            raise requests.ConnectionError(e, request=request)
+        with self._lock:
+            self.requests += 1
+            version = h_response.http_version
+            self.http_versions[version] = self.http_versions.get(version, 0) + 1
+        response = self._build_response(request, h_response)
+        response.elapsed = timedelta(seconds=time.perf_counter() - start)
+        return response
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "http2": True,
+                "max_connections": self.max_connections,
+                "clients": len(self._clients),
+                "requests": self.requests,
+                "http_versions": dict(self.http_versions),
+            }
+
+    def reap_idle(self) -> int:
+        # httpx closes idle connections after its keepalive expiry.
+        return 0
+
+    def close(self):
+        with self._lock:
+            clients, self._clients = list(self._clients.values()), {}
+        for client in clients:
+            client.close()
+
+    def _get_client(self, proxy: Optional[str], verify) -> "httpx.Client":
+        key = (proxy, verify)
+        with self._lock:
+            client = self._clients.get(key)
+            if client is None:
+                client = httpx.Client(transport=self._make_transport(proxy, verify))
+                self._clients[key] = client
+            return client
+
+    def _make_transport(self, proxy: Optional[str], verify) -> "httpx.BaseTransport":
+        limits = httpx.Limits(
+            max_connections=self.max_connections,
+            max_keepalive_connections=self.max_connections,
+        )
+        return httpx.HTTPTransport(
+            http2=True,
+            verify=verify,
+            limits=limits,
+            proxy=proxy,
+            retries=CONNECT_RETRIES,
+        )
+
+    def _build_response(self, request, h_response) -> requests.Response:
+        response = requests.Response()
+        response.status_code = h_response.status_code
+        response.reason = h_response.reason_phrase
+        headers = CaseInsensitiveDict()
+        for name, value in h_response.headers.multi_items():
+            # Join repeated headers like http.client does for requests.
+            headers[name] = f"{headers[name]}, {value}" if name in headers else value
+        response.headers = headers
+        response.encoding = get_encoding_from_headers(response.headers)
+        # httpx already decoded the content encoding.
+        response._content = h_response.read()
+        h_response.close()
+        response._content_consumed = True
+        # Bytes received before decoding, see YtmusicRequestRecord.
+        response.wire_bytes = h_response.num_bytes_downloaded
+        response.url = request.url
+        response.request = request
+        response.connection = self
+        for cookie in h_response.cookies.jar:
+            response.cookies.set_cookie(cookie)
+        return response
+
+
+def _to_httpx_timeout(timeout) -> "httpx.Timeout":
+    if isinstance(timeout, tuple):
+        connect, read = timeout
+        return httpx.Timeout(read, connect=connect)
+    return httpx.Timeout(timeout)
@@ -0,0 +1,432 @@
+import hashlib
+import json
+import logging
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+
+from fuo_ytmusic.models import (
+    PlaylistNestedResult,
+    YtmusicLibraryArtist,
+    YtmusicLibrarySong,
+    YtmusicSearchAlbum,
+)
+from fuo_ytmusic.service import (
+    GLOBAL_LIMIT,
+    YtmusicLibraryKind,
+    YtmusicService,
+    YtmusicType,
+)
+
+logger = logging.getLogger(__name__)
+
+INDEX_MODELS: Dict[YtmusicType, type] = {
+    YtmusicType.so: YtmusicLibrarySong,
+    YtmusicType.al: YtmusicSearchAlbum,
+    YtmusicType.ar: YtmusicLibraryArtist,
+    YtmusicType.pl: PlaylistNestedResult,
+}
+LIBRARY_COLLECTIONS = [
+    (YtmusicLibraryKind.songs, YtmusicType.so),
+    (YtmusicLibraryKind.albums, YtmusicType.al),
+    (YtmusicLibraryKind.subscriptions, YtmusicType.ar),
+    (YtmusicLibraryKind.playlists, YtmusicType.pl),
+]
+# The trigram tokenizer can not match queries shorter than three characters.
+MIN_MATCH_LENGTH = 3
+# Bump it when the tables change; the index is rebuilt from scratch then.
+SCHEMA_VERSION = 2
+
+
+def _identifier(t: YtmusicType, model) -> Optional[str]:
+    if t == YtmusicType.so:
+        return model.videoId
+    if t == YtmusicType.pl:
+        return model.playlistId
+    return model.browseId
+
+
+def _index_text(t: YtmusicType, model) -> str:
+    if t == YtmusicType.so:
+        album = model.album.name if model.album is not None else ""
+        parts = [model.title, model.artists_name, album]
+    elif t == YtmusicType.al:
+        parts = [model.title, model.artists_name]
+    elif t == YtmusicType.ar:
+        parts = [model.artist]
+    else:
+        parts = [model.title, *[author.name for author in model.author or []]]
+    return " ".join(part for part in parts if part).casefold()
+
+
+def fingerprint(*parts) -> str:
+    return hashlib.sha1(json.dumps(parts).encode()).hexdigest()
+
+
+def _page_fingerprint(t: YtmusicType, models: Sequence) -> str:
+    keys = []
+    for model in models:
+        if t == YtmusicType.pl:
+            # The track count tells which playlists to sync, see _sync_playlist.
+            keys.append([model.playlistId, model.count])
+            continue
+        # setVideoId tells apart the same song added to a playlist twice.
+        keys.append(getattr(model, "setVideoId", None) or _identifier(t, model))
+    return fingerprint(keys)
+
+
+class YtmusicLibraryDelta:
+    """Items added to and removed from one collection by a sync."""
+
+    def __init__(self, collection: str, t: YtmusicType, added: list, removed: list):
+        self.collection = collection
+        self.type = t
+        self.added = added  # models
+        self.removed = removed  # identifiers
+
+    def __bool__(self):
+        return bool(self.added or self.removed)
+
+    def __repr__(self):
+        return (
+            f"<YtmusicLibraryDelta {self.collection} "
+            f"+{len(self.added)} -{len(self.removed)}>"
+        )
+
+
+class YtmusicLibraryIndex:
+    """Searchable copy of the user's library in a SQLite file.
+
+    The library is split into collections: the library songs, albums,
+    subscriptions and playlists, and the tracks of every playlist. Each of
+    them has a fingerprint, of its first page or of the playlist track count,
+    so a sync only downloads the collections which changed. Items are stored
+    per account, so switching accounts or profiles never mixes libraries.
+    """
+
+    def __init__(self, path: Path):
+        self._path = Path(path)
+        self._lock = threading.Lock()
+        self._path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self._path), check_same_thread=False)
+        with self._lock, self._conn:
+            self._create_tables()
+
+    def _create_tables(self):
+        conn = self._conn
+        if conn.execute("PRAGMA user_version").fetchone()[0] != SCHEMA_VERSION:
+            for table in ("library_fts", "library", "items", "members"):
+                conn.execute(f"DROP TABLE IF EXISTS {table}")
+            conn.execute("DROP TABLE IF EXISTS collections")
+            conn.execute("DROP TABLE IF EXISTS sync_state")
+            conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS items ("
+            "id INTEGER PRIMARY KEY, account TEXT NOT NULL, kind TEXT NOT NULL, "
+            "identifier TEXT NOT NULL, text TEXT NOT NULL, payload TEXT NOT NULL, "
+            "UNIQUE (account, kind, identifier))"
+        )
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS members ("
+            "account TEXT NOT NULL, collection TEXT NOT NULL, kind TEXT NOT NULL, "
+            "identifier TEXT NOT NULL, "
+            "PRIMARY KEY (account, collection, kind, identifier))"
+        )
+        conn.execute(
+            "CREATE INDEX IF NOT EXISTS members_item "
+            "ON members (account, kind, identifier)"
+        )
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS collections ("
+            "account TEXT NOT NULL, collection TEXT NOT NULL, "
+            "fingerprint TEXT NOT NULL, PRIMARY KEY (account, collection))"
+        )
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS sync_state ("
+            "account TEXT PRIMARY KEY, synced_at REAL NOT NULL)"
+        )
+        try:
+            conn.execute(
+                "CREATE VIRTUAL TABLE IF NOT EXISTS library_fts USING fts5("
+                "text, content='items', content_rowid='id', tokenize='trigram')"
+            )
+        except sqlite3.OperationalError as e:
+            # SQLite older than 3.34 has no trigram tokenizer.
+            logger.info("fts5 trigram is unavailable, scan items instead: %s", e)
+            self._fts = False
+            return
+        self._fts = True
+        conn.executescript(
+            """
+            CREATE TRIGGER IF NOT EXISTS items_ai AFTER INSERT ON items BEGIN
+                INSERT INTO library_fts (rowid, text) VALUES (new.id, new.text);
+            END;
+            CREATE TRIGGER IF NOT EXISTS items_ad AFTER DELETE ON items BEGIN
+                INSERT INTO library_fts (library_fts, rowid, text)
+                VALUES ('delete', old.id, old.text);
+            END;
+            CREATE TRIGGER IF NOT EXISTS items_au AFTER UPDATE ON items BEGIN
+                INSERT INTO library_fts (library_fts, rowid, text)
+                VALUES ('delete', old.id, old.text);
+                INSERT INTO library_fts (rowid, text) VALUES (new.id, new.text);
+            END;
+            """
+        )
+
+    @property
+    def path(self) -> Path:
+        return self._path
+
+    def synced_at(self, account: str) -> Optional[float]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT synced_at FROM sync_state WHERE account = ?", (account,)
+            ).fetchone()
+        return row[0] if row is not None else None
+
+    def get_fingerprint(self, account: str, collection: str) -> Optional[str]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT fingerprint FROM collections "
+                "WHERE account = ? AND collection = ?",
+                (account, collection),
+            ).fetchone()
+        return row[0] if row is not None else None
+
+    def list_collection(self, account: str, collection: str, t: YtmusicType) -> list:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT items.payload FROM members JOIN items "
+                "ON items.account = members.account AND items.kind = members.kind "
+                "AND items.identifier = members.identifier "
+                "WHERE members.account = ? AND members.collection = ? "
+                "AND members.kind = ?",
+                (account, collection, t.value),
+            ).fetchall()
+        model_cls = INDEX_MODELS[t]
+        return [model_cls.model_validate_json(payload) for (payload,) in rows]
+
+    def replace_collection(
+        self,
+        account: str,
+        collection: str,
+        t: YtmusicType,
+        models: Sequence,
+        fingerprint: str = "",
+    ) -> YtmusicLibraryDelta:
+        """Make the collection contain exactly `models`, return the changes."""
+        new: Dict[str, object] = {}
+        for model in models:
+            identifier = _identifier(t, model)
+            if identifier:
+                new.setdefault(identifier, model)
+        with self._lock, self._conn:
+            old = {
+                identifier
+                for (identifier,) in self._conn.execute(
+                    "SELECT identifier FROM members "
+                    "WHERE account = ? AND collection = ? AND kind = ?",
+                    (account, collection, t.value),
+                )
+            }
+            added = [identifier for identifier in new if identifier not in old]
+            removed = [identifier for identifier in old if identifier not in new]
+            self._conn.executemany(
+                "INSERT INTO items (account, kind, identifier, text, payload) "
+                "VALUES (?, ?, ?, ?, ?) "
+                "ON CONFLICT (account, kind, identifier) "
+                "DO UPDATE SET text = excluded.text, payload = excluded.payload",
+                [
+                    (
+                        account,
+                        t.value,
+                        identifier,
+                        _index_text(t, model),
+                        model.model_dump_json(by_alias=True),
+                    )
+                    for identifier, model in new.items()
+                ],
+            )
+            self._conn.executemany(
+                "INSERT INTO members (account, collection, kind, identifier) "
+                "VALUES (?, ?, ?, ?)",
+                [(account, collection, t.value, identifier) for identifier in added],
+            )
+            self._remove_members(account, collection, t, removed)
+            self._conn.execute(
+                "INSERT OR REPLACE INTO collections (account, collection, fingerprint) "
+                "VALUES (?, ?, ?)",
+                (account, collection, fingerprint),
+            )
+        return YtmusicLibraryDelta(
+            collection, t, [new[identifier] for identifier in added], removed
+        )
+
+    def drop_collection(
+        self, account: str, collection: str, t: YtmusicType
+    ) -> YtmusicLibraryDelta:
+        with self._lock, self._conn:
+            removed = [
+                identifier
+                for (identifier,) in self._conn.execute(
+                    "SELECT identifier FROM members "
+                    "WHERE account = ? AND collection = ? AND kind = ?",
+                    (account, collection, t.value),
+                )
+            ]
+            self._remove_members(account, collection, t, removed)
+            self._conn.execute(
+                "DELETE FROM collections WHERE account = ? AND collection = ?",
+                (account, collection),
+            )
+        return YtmusicLibraryDelta(collection, t, [], removed)
+
+    def _remove_members(self, account, collection, t, identifiers):
+        self._conn.executemany(
+            "DELETE FROM members WHERE account = ? AND collection = ? "
+            "AND kind = ? AND identifier = ?",
+            [(account, collection, t.value, identifier) for identifier in identifiers],
+        )
+        # Drop items which no collection refers to anymore.
+        self._conn.executemany(
+            "DELETE FROM items WHERE account = ? AND kind = ? AND identifier = ? "
+            "AND NOT EXISTS (SELECT 1 FROM members WHERE members.account = ? "
+            "AND members.kind = ? AND members.identifier = ?)",
+            [
+                (account, t.value, identifier, account, t.value, identifier)
+                for identifier in identifiers
+            ],
+        )
+
+    def mark_synced(self, account: str):
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO sync_state (account, synced_at) VALUES (?, ?)",
+                (account, time.time()),
+            )
+
+    def search(
+        self, account: str, keyword: str, t: YtmusicType, limit: int = GLOBAL_LIMIT
+    ) -> Optional[list]:
+        """Search items of type t, or return None if t is not indexed."""
+        model_cls = INDEX_MODELS.get(t)
+        if model_cls is None:
+            return None
+        keyword = keyword.strip().casefold()
+        if not keyword:
+            return []
+        if self._fts and len(keyword) >= MIN_MATCH_LENGTH:
+            query = (
+                "SELECT items.payload FROM library_fts "
+                "JOIN items ON items.id = library_fts.rowid "
+                "WHERE library_fts MATCH ? AND items.account = ? AND items.kind = ? "
+                "ORDER BY library_fts.rank LIMIT ?"
+            )
+            # Quote the keyword, so that it is matched as a single phrase.
+            params = ('"{}"'.format(keyword.replace('"', '""')), account, t.value)
+        else:
+            query = (
+                "SELECT payload FROM items "
+                "WHERE instr(text, ?) > 0 AND account = ? AND kind = ? LIMIT ?"
+            )
+            params = (keyword, account, t.value)
+        with self._lock:
+            rows = self._conn.execute(query, (*params, limit)).fetchall()
+        return [model_cls.model_validate_json(payload) for (payload,) in rows]
+
+    def sync(
+        self, service: YtmusicService, account: str, full: bool = False
+    ) -> List[YtmusicLibraryDelta]:
+        """Bring the index up to date and return the non-empty deltas.
+
+        Only the first page of every library collection is fetched to tell
+        whether it changed, unless `full` is true. Playlists are compared by
+        the track count of the library listing, and only the changed ones are
+        fetched. So a change which keeps the count of a playlist, or a change
+        of a playlist beyond the first page of the listing, is only noticed
+        by a full sync.
+        """
+        deltas = []
+        playlists = None
+        for kind, t in LIBRARY_COLLECTIONS:
+            collection = f"library:{kind.value}"
+            first_page, continuation = service.library_page(kind)
+            page_fingerprint = _page_fingerprint(t, first_page)
+            if not full and page_fingerprint == self.get_fingerprint(
+                account, collection
+            ):
+                if t == YtmusicType.pl:
+                    playlists = self.list_collection(account, collection, t)
+                continue
+            models = list(first_page)
+            if first_page and continuation:
+                models.extend(_read_pages(service.library_page, kind, continuation))
+            deltas.append(
+                self.replace_collection(
+                    account, collection, t, models, page_fingerprint
+                )
+            )
+            if t == YtmusicType.pl:
+                playlists = models
+                for playlist_id in deltas[-1].removed:
+                    deltas.append(
+                        self.drop_collection(
+                            account, f"playlist:{playlist_id}", YtmusicType.so
+                        )
+                    )
+        for playlist in playlists or []:
+            try:
+                delta = self._sync_playlist(service, account, playlist, full)
+            except Exception as e:
+                logger.warning("index playlist %s failed: %s", playlist.playlistId, e)
+                continue
+            if delta is not None:
+                deltas.append(delta)
+        self.mark_synced(account)
+        deltas = [delta for delta in deltas if delta]
+        logger.info("ytmusic library index synced: %s", deltas)
+        return deltas
+
+    def _sync_playlist(self, service, account, playlist, full):
+        collection = f"playlist:{playlist.playlistId}"
+        stored = None if full else self.get_fingerprint(account, collection)
+        if playlist.count is not None:
+            listed = fingerprint(playlist.count)
+            if listed == stored:
+                return None
+        tracks, continuation = service.playlist_tracks_page(playlist.playlistId)
+        if playlist.count is None:
+            # The listing has no count for some playlists, compare the first
+            # page of tracks instead.
+            listed = fingerprint(None, _page_fingerprint(YtmusicType.so, tracks))
+            if listed == stored:
+                return None
+        tracks = list(tracks)
+        if tracks and continuation:
+            tracks.extend(
+                _read_pages(
+                    service.playlist_tracks_page, playlist.playlistId, continuation
+                )
+            )
+        return self.replace_collection(
+            account, collection, YtmusicType.so, tracks, listed
+        )
+
+    def clear(self):
+        with self._lock, self._conn:
+            for table in ("items", "members", "collections", "sync_state"):
+                self._conn.execute(f"DELETE FROM {table}")
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+def _read_pages(fetch_page, key, continuation=None):
+    while True:
+        models, continuation = fetch_page(key, continuation)
+        yield from models
+        if not models or not continuation:
+            break
@@ -0,0 +1,71 @@
+import re
+import time
+from typing import Hashable, List, Optional
+
+from feeluown.media import Media
+
+from fuo_ytmusic.cache import LruTtlCache
+
+# googlevideo urls carry the expiry time either as a query parameter
+# (`expire=1700000000`) or as a path segment (`/expire/1700000000/`).
+_EXPIRE_RE = re.compile(r"[?&/]expire[=/](\d+)")
+
+
+def parse_url_expiry(url: str) -> Optional[int]:
+    """Return the unix timestamp when the stream url expires, if known."""
+    match = _EXPIRE_RE.search(url or "")
+    return int(match.group(1)) if match else None
+
+
+def media_urls(media: Media) -> List[str]:
+    manifest = media.manifest
+    if manifest is not None:
+        return [
+            url
+            for url in (
+                getattr(manifest, "video_url", ""),
+                getattr(manifest, "audio_url", ""),
+            )
+            if url
+        ]
+    return [media.url] if media.url else []
+
+
+class YtmusicMediaCache:
+    """Cache resolved media until shortly before their stream urls expire."""
+
+    # Stop serving an url this many seconds before it expires, so that the
+    # player does not start with an url which becomes invalid soon.
+    SAFETY_MARGIN = 5 * 60
+    # Used when the url does not tell when it expires.
+    DEFAULT_TTL = 30 * 60
+
+    def __init__(self, maxsize: int = 128, timer=time.time):
+        self._timer = timer
+        self._cache = LruTtlCache(maxsize, self.DEFAULT_TTL, timer=timer)
+
+    def get(self, key: Hashable) -> Optional[Media]:
+        media, exist = self._cache.get(key)
+        return media if exist else None
+
+    def set(self, key: Hashable, media: Media) -> bool:
+        expiries = [parse_url_expiry(url) for url in media_urls(media)]
+        expiries = [expiry for expiry in expiries if expiry is not None]
+        if expiries:
+            ttl = min(expiries) - self._timer() - self.SAFETY_MARGIN
+        else:
+            ttl = self.DEFAULT_TTL
+        if ttl <= 0:
+            return False
+        self._cache.set(key, media, ttl=ttl)
+        return True
+
+    def invalidate_url(self, url: str) -> int:
+        """Drop entries which use the url, e.g. after the server returned 403."""
+        return self._cache.pop_where(lambda media: url in media_urls(media))
+
+    def clear(self):
+        self._cache.clear()
+
+    def stats(self) -> dict:
+        return self._cache.stats()
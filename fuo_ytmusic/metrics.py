@@ -0,0 +1,174 @@
+import math
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from functools import wraps
+from typing import Callable, Deque, Dict, Tuple
+
+QUANTILES = (0.5, 0.95, 0.99)
+# Quantiles are computed over the latest samples of each call, so they follow
+# the current network conditions and memory stays bounded.
+MAX_SAMPLES = 1024
+
+
+class LatencyHistogram:
+    def __init__(self, max_samples: int = MAX_SAMPLES):
+        self._samples: Deque[float] = deque(maxlen=max_samples)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, seconds: float):
+        self._samples.append(seconds)
+        self.count += 1
+        self.sum += seconds
+
+    def quantiles(self) -> Dict[float, float]:
+        samples = sorted(self._samples)
+        if not samples:
+            return {}
+        # Nearest-rank quantiles.
+        return {q: samples[max(math.ceil(q * len(samples)) - 1, 0)] for q in QUANTILES}
+
+
+class YtmusicMetrics:
+    """Latency, error and cache metrics of YouTube Music calls.
+
+    Calls are named like "service.search" or "http.browse". Caches are
+    reported by sources, callables which return {name: stats} where stats
+    has "hits" and "misses", like LruTtlCache.stats.
+    """
+
+    def __init__(self, timer: Callable[[], float] = None):
+        self._timer = timer or time.perf_counter
+        self._lock = threading.Lock()
+        self._histograms: Dict[str, LatencyHistogram] = {}
+        # (call name, exception class name) -> count
+        self._errors: Dict[Tuple[str, str], int] = {}
+        self._cache_sources: Dict[str, Callable[[], dict]] = {}
+
+    def observe(self, name: str, seconds: float, error: str = None):
+        with self._lock:
+            histogram = self._histograms.get(name)
+            if histogram is None:
+                histogram = self._histograms[name] = LatencyHistogram()
+            histogram.observe(seconds)
+            if error is not None:
+                key = (name, error)
+                self._errors[key] = self._errors.get(key, 0) + 1
+
+    @contextmanager
+    def timed(self, name: str):
+        start = self._timer()
+        try:
+            yield
+        except BaseException as e:
+            self.observe(name, self._timer() - start, type(e).__name__)
+            raise
+        self.observe(name, self._timer() - start)
+
+    def timer(self, name: str):
+        """Decorator which times each call of a function as `name`."""
+
+        def decorator(func):
+            @wraps(func)
+            def wrapper(*args, **kwargs):
+                with self.timed(name):
+                    return func(*args, **kwargs)
+
+            return wrapper
+
+        return decorator
+
+    def instrument(
+        self, cls, prefix: str, exclude: Callable[[str], bool] = lambda name: False
+    ):
+        """Time every public method defined by cls, as "<prefix>.<method>".
+
+        Attributes of the methods, like `cache_clear` of cached methods, are
+        kept on the wrappers.
+        """
+        for attr, value in list(vars(cls).items()):
+            if attr.startswith("_") or exclude(attr):
+                continue
+            if not callable(value) or isinstance(value, (staticmethod, classmethod)):
+                continue
+            if isinstance(value, type):
+                continue
+            setattr(cls, attr, self.timer(f"{prefix}.{attr}")(value))
+        return cls
+
+    def add_cache_source(self, name: str, source: Callable[[], dict]):
+        self._cache_sources[name] = source
+
+    def reset(self):
+        with self._lock:
+            self._histograms.clear()
+            self._errors.clear()
+
+    def as_dict(self) -> dict:
+        with self._lock:
+            calls = {
+                name: {
+                    "count": h.count,
+                    "sum": h.sum,
+                    **{f"p{int(q * 100)}": v for q, v in h.quantiles().items()},
+                    "errors": {
+                        error: count
+                        for (call, error), count in self._errors.items()
+                        if call == name
+                    },
+                }
+                for name, h in self._histograms.items()
+            }
+        caches = {}
+        for source_name, source in list(self._cache_sources.items()):
+            for name, stats in source().items():
+                hits, misses = stats.get("hits", 0), stats.get("misses", 0)
+                caches[f"{source_name}.{name}"] = {
+                    "hits": hits,
+                    "misses": misses,
+                    "hit_ratio": hits / (hits + misses) if hits + misses else None,
+                }
+        return {"calls": calls, "caches": caches}
+
+    def prometheus_text(self) -> str:
+        data = self.as_dict()
+        lines = [
+            "# HELP ytmusic_call_seconds Latency of YouTube Music calls.",
+            "# TYPE ytmusic_call_seconds summary",
+        ]
+        for name, call in sorted(data["calls"].items()):
+            label = f'name="{_escape(name)}"'
+            for q in QUANTILES:
+                value = call.get(f"p{int(q * 100)}")
+                if value is not None:
+                    lines.append(
+                        f'ytmusic_call_seconds{{{label},quantile="{q}"}} {value}'
+                    )
+            lines.append(f"ytmusic_call_seconds_sum{{{label}}} {call['sum']}")
+            lines.append(f"ytmusic_call_seconds_count{{{label}}} {call['count']}")
+        lines.append("# HELP ytmusic_call_errors_total Failed YouTube Music calls.")
+        lines.append("# TYPE ytmusic_call_errors_total counter")
+        for name, call in sorted(data["calls"].items()):
+            for error, count in sorted(call["errors"].items()):
+                lines.append(
+                    f'ytmusic_call_errors_total{{name="{_escape(name)}",'
+                    f'error="{_escape(error)}"}} {count}'
+                )
+        for kind in ("hits", "misses"):
+            lines.append(f"# HELP ytmusic_cache_{kind}_total Cache {kind}.")
+            lines.append(f"# TYPE ytmusic_cache_{kind}_total counter")
+            for name, cache in sorted(data["caches"].items()):
+                lines.append(
+                    f'ytmusic_cache_{kind}_total{{cache="{_escape(name)}"}} '
+                    f"{cache[kind]}"
+                )
+        return "\n".join(lines) + "\n"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+metrics = YtmusicMetrics()
@@ -24,7 +24,7 @@ from feeluown.library import (
 from feeluown.media import Quality
 from feeluown.utils.reader import SequentialReader
 from pydantic import BaseModel as PydanticBaseModel
-from pydantic import Field
+from pydantic import Field, TypeAdapter
 
 from fuo_ytmusic.timeparse import timeparse
 
@@ -72,6 +72,21 @@ class BaseModel(PydanticBaseModel, metaclass=AllowOptional):
     def source(self):
         return "ytmusic"
 
+    @classmethod
+    def parse_list(cls, items: list) -> list:
+        """Validate a list of payloads at once.
+
+        The whole list is validated by pydantic-core in a single call, which
+        is noticeably faster than `[cls(**item) for item in items]` for
+        library and playlist pages of hundreds of items.
+        """
+        adapter = cls.__dict__.get("_list_adapter")
+        if adapter is None:
+            adapter = TypeAdapter(List[cls])
+            # Not a pydantic field: set it on the class after it is created.
+            type.__setattr__(cls, "_list_adapter", adapter)
+        return adapter.validate_python(items)
+
 
 class SearchNestedArtist(BaseModel):
     id: str
@@ -600,6 +615,8 @@ class PlaylistNestedResult(BaseModel, YtmusicCoverMixin):
     title: str
     playlistId: str
     author: List[PlaylistAuthor] | None = None
+    # Track count in library listings, play count on the home page.
+    count: Union[int, str, None] = None
 
     def v2_brief_model(self) -> BriefPlaylistModel:
         return BriefPlaylistModel(
@@ -612,7 +629,6 @@ class PlaylistNestedResult(BaseModel, YtmusicCoverMixin):
 
 class YtmusicHomePlaylist(PlaylistNestedResult):
     description: str = ""
-    count: Union[int, str, None] = None
 
     @staticmethod
     def parse_play_count(raw_count) -> int:
@@ -695,7 +711,6 @@ class PlaylistInfo(BaseModel, YtmusicCoverMixin):
     duration: str
     trackCount: int
     tracks: List[YtmusicLibrarySong]
-    fetched_tracks: set = Field(default_factory=set)
 
     def v2_model(self):
         creator = None
@@ -716,33 +731,45 @@ class PlaylistInfo(BaseModel, YtmusicCoverMixin):
 
     def reader(self, provider) -> SequentialReader:
         total_count = self.trackCount
-        self.fetched_tracks = set()
 
         def g():
-            counter = 0
-            offset = 0
-            per = 50
-            while offset < total_count:
-                end = min(offset + per, total_count)
-                data: PlaylistInfo = provider.service.playlist_info(self.id, limit=end)
-                tracks_data = data.tracks
-                for track_data in tracks_data:
-                    if (
-                        track_data.videoId is not None
-                        and track_data.videoId in self.fetched_tracks
-                    ):
-                        continue
-                    self.fetched_tracks.add(track_data.videoId)
-                    counter += 1
+            # The model may be shared by several readers through the cache,
+            # so every reader keeps its own seen ids.
+            seen = set()
+            continuation = None
+            while True:
+                tracks, continuation = provider.service.playlist_tracks_page(
+                    self.id, continuation
+                )
+                page_tracks = set()
+                for track_data in tracks:
+                    video_id = track_data.videoId
+                    if video_id is not None:
+                        if video_id in seen:
+                            continue
+                        seen.add(video_id)
+                        page_tracks.add(video_id)
                     yield track_data.v2_brief_model()
-                if counter >= total_count:
+                if not tracks or not continuation:
                     break
-                offset += per
-            self.fetched_tracks.clear()
+                # Continuation pages never overlap, so only the latest page is
+                # kept to guard against a repeated item at the page boundary.
+                seen = page_tracks
 
         return SequentialReader(g(), total_count)
 
 
+class ArtistPage(BaseModel):
+    """Everything the artist page shows, fetched in one go."""
+
+    info: ArtistInfo
+    # None if the artist has no songs playlist, or it was not requested.
+    songs: Optional[PlaylistInfo] = None
+    # None if they were not requested.
+    albums: Optional[List[YtmusicSearchAlbum]] = None
+    singles: Optional[List[YtmusicSearchAlbum]] = None
+
+
 class PlaylistAddItemResponse(BaseModel):
     class PlaylistEditResult(BaseModel):
         videoId: str
@@ -21,8 +21,7 @@ class ExploreBackend(QObject):
         self._app = app
 
     async def categories(self):
-        loop = asyncio.get_event_loop()
-        categories = await loop.run_in_executor(None, self._provider.categories)
+        categories = await self._provider.aio_service.categories()
         result = [
             {
                 "key": category.key,
@@ -37,10 +36,7 @@ class ExploreBackend(QObject):
         return categories
 
     async def playlists(self, params: str):
-        loop = asyncio.get_event_loop()
-        playlists = await loop.run_in_executor(
-            None, self._provider.service.category_playlists, params
-        )
+        playlists = await self._provider.aio_service.category_playlists(params)
         result = [
             {"id": p.playlistId, "name": p.title, "cover": p.thumbnail}
             for p in playlists
@@ -0,0 +1,86 @@
+import logging
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Dict, Hashable, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class YtmusicMediaPrefetcher:
+    """Resolve media of upcoming songs on a small background pool.
+
+    Each call to `prefetch` replaces the previous list of upcoming songs.
+    Jobs for songs which are no longer upcoming are cancelled if they have
+    not started yet.
+    """
+
+    def __init__(
+        self,
+        resolve: Callable[[object, object], object],
+        make_key: Callable[[object, object], Hashable],
+        max_workers: int = 2,
+    ):
+        self._resolve = resolve
+        self._make_key = make_key
+        self._max_workers = max_workers
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._futures: Dict[Hashable, Future] = {}
+        # Reentrant: a done callback runs in place when the job already ended.
+        self._lock = threading.RLock()
+
+    def prefetch(self, songs: Iterable, quality) -> List[Future]:
+        jobs: List[Tuple[Hashable, object]] = []
+        wanted = set()
+        for song in songs:
+            key = self._make_key(song, quality)
+            if key not in wanted:
+                wanted.add(key)
+                jobs.append((key, song))
+        futures = []
+        with self._lock:
+            for key in list(self._futures):
+                if key not in wanted:
+                    self._futures.pop(key).cancel()
+            for key, song in jobs:
+                future = self._futures.get(key)
+                if future is None:
+                    future = self._get_executor().submit(self._run, song, quality)
+                    self._futures[key] = future
+                    future.add_done_callback(lambda f, key=key: self._on_done(key, f))
+                futures.append(future)
+        return futures
+
+    def cancel(self):
+        """Cancel all jobs which have not started yet."""
+        self.prefetch([], None)
+
+    def get_pending(self, key: Hashable) -> Optional[Future]:
+        with self._lock:
+            return self._futures.get(key)
+
+    def shutdown(self):
+        self.cancel()
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False)
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self._max_workers, thread_name_prefix="ytmusic-prefetch"
+            )
+        return self._executor
+
+    def _run(self, song, quality):
+        try:
+            return self._resolve(song, quality)
+        except Exception as e:
+            logger.info("prefetch media for %s failed: %s", song.identifier, e)
+            raise
+
+    def _on_done(self, key: Hashable, future: Future):
+        # Results live in the media cache, so forget finished jobs.
+        with self._lock:
+            if self._futures.get(key) is future:
+                del self._futures[key]
@@ -1,5 +1,14 @@
 import logging
-from typing import List, Optional, Tuple
+import threading
+import time
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    Future,
+    ThreadPoolExecutor,
+    as_completed,
+    wait,
+)
+from typing import Iterator, List, Optional, Tuple
 
 from feeluown.excs import NoUserLoggedIn, ProviderIOError
 from feeluown.library import (
@@ -22,9 +31,12 @@ from feeluown.library import (
 from feeluown.library.model_protocol import BriefSongProtocol
 from feeluown.media import Media, MediaType, Quality, VideoAudioManifest
 from feeluown.utils.dispatch import Signal
+from feeluown.utils.reader import SequentialReader
 from yt_dlp import DownloadError, YoutubeDL
 from yt_dlp.version import __version__ as YTDLP_VERSION
 
+from fuo_ytmusic.aio_service import AsyncYtmusicService
+from fuo_ytmusic.cache import LruTtlCache
 from fuo_ytmusic.consts import HEADER_FILE
 from fuo_ytmusic.headerfile import (
     YtdlpCookiefileManager,
@@ -32,11 +44,23 @@ from fuo_ytmusic.headerfile import (
     update_profile_gaia_id,
 )
 from fuo_ytmusic.home_recommendation import YtmusicHomeRecommendationBuilder
+from fuo_ytmusic.library_index import YtmusicLibraryIndex
+from fuo_ytmusic.media_cache import YtmusicMediaCache, media_urls
+from fuo_ytmusic.metrics import metrics
 from fuo_ytmusic.models import (
     Categories,
     YtmusicWatchPlaylistSong,
 )
-from fuo_ytmusic.service import YtmusicPrivacyStatus, YtmusicService, YtmusicType
+from fuo_ytmusic.prefetch import YtmusicMediaPrefetcher
+from fuo_ytmusic.service import (
+    HOME_PAGE_CACHE_TTL,
+    YtmusicLibraryKind,
+    YtmusicPrivacyStatus,
+    YtmusicScope,
+    YtmusicService,
+    YtmusicType,
+)
+from fuo_ytmusic.ytdlp_pool import YtdlpExtractorPool
 
 logger = logging.getLogger(__name__)
 
@@ -50,6 +74,22 @@ class _NoCookieSaveYoutubeDL(YoutubeDL):
         return
 
 
+class SongMediaResult:
+    """Outcome of resolving the media of one song in song_list_media."""
+
+    def __init__(self, song, media: Optional[Media] = None, error=None):
+        self.song = song
+        self.media = media
+        self.error = error
+
+    @property
+    def ok(self) -> bool:
+        return self.media is not None
+
+    def __repr__(self):
+        return f"<SongMediaResult song={self.song.identifier} ok={self.ok}>"
+
+
 def _parse_ytdlp_version(version: str) -> Optional[Tuple[int, int, int]]:
     parts = version.split(".")
     if len(parts) < 3:
@@ -62,6 +102,20 @@ def _parse_ytdlp_version(version: str) -> Optional[Tuple[int, int, int]]:
 
 class YtmusicProvider(AbstractProvider, ProviderV2):
     HOME_SECTION_LIMIT = 12
+    # Types fetched by search_concurrently, when not given explicitly.
+    CONCURRENT_SEARCH_TYPES = (
+        SearchType.so,
+        SearchType.al,
+        SearchType.ar,
+        SearchType.pl,
+        SearchType.vi,
+    )
+    # How many upcoming songs song_prefetch_media resolves ahead.
+    PREFETCH_MEDIA_LIMIT = 3
+    # The library index is refreshed incrementally at this interval, and is
+    # synced from scratch once the last sync is older than the max age.
+    LIBRARY_INDEX_REFRESH_INTERVAL = 30 * 60
+    LIBRARY_INDEX_MAX_AGE = 24 * 60 * 60
     # NOTE:
     # yt-dlp >= 2025.12.08 may fail with cookiefile in some YouTube Music
     # sessions due to PO token restrictions. For these versions, keep running
@@ -73,9 +127,12 @@ class YtmusicProvider(AbstractProvider, ProviderV2):
     def __init__(self):
         super(YtmusicProvider, self).__init__()
         self.service: YtmusicService = YtmusicService()
+        self.aio_service = AsyncYtmusicService(self.service)
         self._home_recommendation_builder = YtmusicHomeRecommendationBuilder(
             source=self.meta.identifier
         )
+        # (continuation, account key) -> (home page sections, their collections)
+        self._home_collections_cache = LruTtlCache(8, HOME_PAGE_CACHE_TTL)
         self.current_user_changed = Signal()
         self._user = None
         self._http_proxy = ""
@@ -85,14 +142,41 @@ class YtmusicProvider(AbstractProvider, ProviderV2):
             "socket_timeout": 2,
             "extractor_retries": 0,  # reduce retry
         }
+        # Look up _NoCookieSaveYoutubeDL lazily so that it can be patched.
+        self._ytdlp_pool = YtdlpExtractorPool(lambda opts: _NoCookieSaveYoutubeDL(opts))
+        self._media_cache = YtmusicMediaCache()
+        self._media_prefetcher = YtmusicMediaPrefetcher(
+            self._prefetch_song_media, self._song_media_cache_key
+        )
+        self.service.stream_url_forbidden.connect(self._media_cache.invalidate_url)
+        metrics.add_cache_source("media", lambda: {"urls": self._media_cache.stats()})
+        # Emitted with a list of YtmusicLibraryDelta after a sync changed it.
+        self.library_index_changed = Signal()
+        self._library_index: Optional[YtmusicLibraryIndex] = None
+        self._library_index_lock = threading.Lock()
+        self._library_index_stop: Optional[threading.Event] = None
+        self._search_executor: Optional[ThreadPoolExecutor] = None
+        self._search_futures: List[Future] = []
+        self._search_lock = threading.Lock()
 
     def setup_http_proxy(self, http_proxy):
         self._http_proxy = http_proxy
         self.service.setup_http_proxy(http_proxy)
+        self._ytdlp_pool.clear()
 
     def setup_http_timeout(self, timeout):
         self.service.setup_timeout(timeout)
         self._default_ytdl_opts["socket_timeout"] = timeout
+        self._ytdlp_pool.clear()
+
+    def setup_http_pool(self, pool_maxsize):
+        self.service.setup_http_pool(pool_maxsize)
+
+    def setup_http2(self, enabled):
+        self.service.setup_http2(enabled)
+
+    def setup_http_metrics(self, enabled):
+        self.service.setup_http_metrics(enabled)
 
     def _build_audio_ytdl_opts(self):
         return {
@@ -125,6 +209,74 @@ class YtmusicProvider(AbstractProvider, ProviderV2):
     def setup_language(self, language: str):
         self.service.setup_language(language)
 
+    def setup_disk_cache(self, path):
+        self.service.setup_disk_cache(path)
+
+    def setup_library_index(self, path):
+        """Keep a local index of the user's library for offline search.
+
+        The index is synced in background when a user logs in, and then
+        refreshed every LIBRARY_INDEX_REFRESH_INTERVAL. None disables it.
+        """
+        if self._library_index is not None:
+            self._library_index_stop.set()
+            self.current_user_changed.disconnect(self._on_user_changed_sync_index)
+            self._library_index.close()
+        if path is None:
+            self._library_index = None
+            return
+        self._library_index = YtmusicLibraryIndex(path)
+        self._library_index_stop = threading.Event()
+        self.current_user_changed.connect(self._on_user_changed_sync_index)
+        threading.Thread(
+            target=self._refresh_library_index,
+            args=(self._library_index_stop,),
+            name="ytmusic-library-index-refresh",
+            daemon=True,
+        ).start()
+
+    def sync_library_index(self, full: Optional[bool] = None):
+        """Sync the library index and return the deltas.
+
+        By default, the sync is incremental unless the last one is older than
+        LIBRARY_INDEX_MAX_AGE. Return None if a sync is already running.
+        """
+        index = self._library_index
+        if index is None or not self._library_index_lock.acquire(blocking=False):
+            return None
+        try:
+            account = self.service.account_key()
+            if full is None:
+                synced_at = index.synced_at(account)
+                full = (
+                    synced_at is None
+                    or time.time() - synced_at > self.LIBRARY_INDEX_MAX_AGE
+                )
+            deltas = index.sync(self.service, account, full=full)
+        finally:
+            self._library_index_lock.release()
+        if deltas:
+            self.library_index_changed.emit(deltas)
+        return deltas
+
+    def _on_user_changed_sync_index(self, _user):
+        threading.Thread(
+            target=self._sync_library_index_quietly,
+            name="ytmusic-library-index",
+            daemon=True,
+        ).start()
+
+    def _refresh_library_index(self, stop: threading.Event):
+        while not stop.wait(self.LIBRARY_INDEX_REFRESH_INTERVAL):
+            if self._user is not None:
+                self._sync_library_index_quietly()
+
+    def _sync_library_index_quietly(self):
+        try:
+            self.sync_library_index()
+        except Exception as e:
+            logger.warning("sync ytmusic library index failed: %s", e)
+
     def img_url_to_media(self, pic_url: str) -> Media:
         if self._http_proxy:
             return Media(pic_url, MediaType.image, http_proxy=self._http_proxy)
@@ -241,13 +393,8 @@ class YtmusicProvider(AbstractProvider, ProviderV2):
         return user
 
     def current_user_list_playlists(self):
-        playlists = self.service.library_playlists(100)
-        # HACK: FeelUOwn fetches playlists in two places:
-        # 1. current_user_list_playlists
-        # 2. current_user_fav_create_playlists_rd
-        # We cache the playlists in current_user_list_playlists, so that we can
-        # avoid fetching playlists in current_user_fav_create_playlists_rd.
-        self._user.cache_set("playlists", playlists, ttl=10)
+        # Playlists are returned as a list, so all pages are fetched.
+        playlists = self.service.library_playlists(None)
         user_playlists = []
         for playlist in [p.v2_brief_model() for p in playlists]:
             # HACK: use name to filter playlists, because the user identifier
@@ -257,40 +404,105 @@ class YtmusicProvider(AbstractProvider, ProviderV2):
         return user_playlists
 
     def current_user_fav_create_songs_rd(self):
-        songs = self.service.library_songs(100)
-        return [song.v2_model() for song in songs]
+        return self._library_reader(
+            YtmusicLibraryKind.songs, lambda song: song.v2_model()
+        )
 
     def current_user_fav_create_artists_rd(self):
-        artists = self.service.library_subscription_artists(100)
-        return [artist.v2_brief_model() for artist in artists]
+        return self._library_reader(
+            YtmusicLibraryKind.subscriptions, lambda artist: artist.v2_brief_model()
+        )
 
     def current_user_fav_create_albums_rd(self):
-        albums = self.service.library_albums(100)
-        return [album.v2_brief_model() for album in albums]
+        return self._library_reader(
+            YtmusicLibraryKind.albums, lambda album: album.v2_brief_model()
+        )
+
+    def _library_reader(self, kind, to_model):
+        """Read library pages through continuations, one page at a time."""
+
+        def g():
+            continuation = None
+            while True:
+                items, continuation = self.service.library_page(kind, continuation)
+                for item in items:
+                    yield to_model(item)
+                if not items or not continuation:
+                    break
+
+        # The library endpoints do not tell the total count.
+        return SequentialReader(g(), None)
 
     def current_user_fav_create_playlists_rd(self) -> List[BriefPlaylistModel]:
-        playlists, exist = self._user.cache_get("playlists")
-        if not exist:
-            playlists = self.service.library_playlists(100)
+        playlists = self.service.library_playlists(None)
         user_fav_playlists = []
         for playlist in [p.v2_brief_model() for p in playlists]:
             if playlist.creator_name != self._user.name:
                 user_fav_playlists.append(playlist)
         return user_fav_playlists
 
-    def _get_daily_home_sections(self, limit: int = HOME_SECTION_LIMIT):
-        try:
-            return self.service.home_sections(limit=limit)
-        except Exception as e:
-            logger.warning("fetch ytmusic home sections failed: %s", e)
-            return []
+    def _home_page_collections(self, continuation: Optional[str] = None):
+        """Return the collections of each home page section and the continuation.
+
+        rec_list_collections, the daily recommendations and
+        rec_collections_rd all start from the home pages, so the collections
+        are reused while the page is still the cached one, instead of
+        building every model again.
+        """
+        sections, next_continuation = self.service.home_page(continuation)
+        key = (continuation, self.service.account_key())
+        value, exist = self._home_collections_cache.get(key)
+        if exist and value[0] is sections:
+            return value[1], next_continuation
+        builder = self._home_recommendation_builder
+        collections = [builder.build_section_collections(s) for s in sections]
+        self._home_collections_cache.set(key, (sections, collections))
+        return collections, next_continuation
 
     def rec_list_collections(self, limit: Optional[int] = None) -> List[Collection]:
+        """Return the collections of the first `limit` home sections.
+
+        Home pages are requested one by one, and a continuation is only
+        followed while fewer than `limit` sections have been read.
+        """
         section_limit = self._home_recommendation_builder.normalize_limit(
             limit, self.HOME_SECTION_LIMIT
         )
-        sections = self._get_daily_home_sections(limit=section_limit)
-        return self._home_recommendation_builder.build_collections(sections)
+        collections: List[Collection] = []
+        remaining = section_limit
+        continuation = None
+        while remaining > 0:
+            try:
+                page, continuation = self._home_page_collections(continuation)
+            except Exception as e:
+                # Keep the sections of the pages already read.
+                logger.warning("fetch ytmusic home page failed: %s", e)
+                break
+            for section_collections in page[:remaining]:
+                collections.extend(section_collections)
+            remaining -= len(page)
+            if not page or not continuation:
+                break
+        return collections
+
+    def rec_collections_rd(self) -> SequentialReader:
+        """Read home collections page by page, as the home page scrolls.
+
+        Unlike rec_list_collections, which reads up to HOME_SECTION_LIMIT
+        sections at once, more pages are only requested when read.
+        """
+
+        def g():
+            continuation = None
+            while True:
+                page, continuation = self._home_page_collections(continuation)
+                for section_collections in page:
+                    yield from section_collections
+                if not page or not continuation:
+                    break
+
+        # The home page does not tell how many sections there are.
+        return SequentialReader(g(), None)
 
     def rec_list_daily_songs(self) -> List[BriefSongModel]:
         songs: List[BriefSongModel] = []
@@ -394,10 +606,14 @@ class YtmusicProvider(AbstractProvider, ProviderV2):
     def categories(self) -> List[Categories]:
         return self.service.categories()
 
-    def search(self, keyword, type_, *args, **kwargs):
+    def search(self, keyword, type_, *args, scope=None, **kwargs):
         type_ = SearchType.parse(type_)
         ytmusic_type = YtmusicType.parse(type_)
-        results = self.service.search(keyword, ytmusic_type)
+        results = None
+        if scope == YtmusicScope.li:
+            results = self._search_library_index(keyword, ytmusic_type)
+        if results is None:
+            results = self.service.search(keyword, ytmusic_type, scope)
         model = SimpleSearchResult(q=keyword)
         if results:
             try:
@@ -413,6 +629,78 @@ class YtmusicProvider(AbstractProvider, ProviderV2):
         setattr(model, ytmusic_type.value, models)
         return model
 
+    def search_rd(self, keyword, type_, scope=None):
+        """Read search results of one type page by page.
+
+        Unlike `search`, which returns a single fixed-size page, the reader
+        only requests the next page through its continuation when the
+        consumer reads past the results already fetched.
+        """
+        ytmusic_type = YtmusicType.parse(SearchType.parse(type_))
+
+        def g():
+            continuation = None
+            while True:
+                results, continuation = self.service.search_page(
+                    keyword, ytmusic_type, scope, continuation
+                )
+                for result in results:
+                    try:
+                        result.v2_model
+                    except AttributeError:
+                        yield result.v2_brief_model()
+                    else:
+                        yield result.v2_model()
+                if not results or not continuation:
+                    break
+
+        # Search responses do not tell the total count.
+        return SequentialReader(g(), None)
+
+    def search_concurrently(
+        self, keyword, types=None, scope=None
+    ) -> Iterator[SimpleSearchResult]:
+        """Search several types at once, yield each result once it arrives.
+
+        A new call supersedes the previous one: its searches which have not
+        started are cancelled, and its iterator stops yielding results.
+        A type whose search fails is logged and skipped.
+        """
+        types = [SearchType.parse(t) for t in types or self.CONCURRENT_SEARCH_TYPES]
+        with self._search_lock:
+            for future in self._search_futures:
+                future.cancel()
+            if self._search_executor is None:
+                self._search_executor = ThreadPoolExecutor(
+                    max_workers=len(self.CONCURRENT_SEARCH_TYPES),
+                    thread_name_prefix="ytmusic-search",
+                )
+            futures = {
+                self._search_executor.submit(self.search, keyword, t, scope=scope): t
+                for t in types
+            }
+            current = self._search_futures = list(futures)
+        return self._iter_search_results(futures, current)
+
+    def _iter_search_results(self, futures, current):
+        for future in as_completed(futures):
+            if future.cancelled() or self._search_futures is not current:
+                return
+            try:
+                yield future.result()
+            except Exception as e:
+                logger.warning("search %s failed: %s", futures[future].value, e)
+
+    def _search_library_index(self, keyword, ytmusic_type):
+        """Search the local library index, or return None if it can't answer."""
+        index = self._library_index
+        if index is None or ytmusic_type is None:
+            return None
+        account = self.service.account_key()
+        if index.synced_at(account) is None:
+            return None
+        return index.search(account, keyword, ytmusic_type)
+
     def song_list_quality(self, song) -> List[Quality.Audio]:
         return [Quality.Audio.sq]
 
@@ -432,8 +720,9 @@ class YtmusicProvider(AbstractProvider, ProviderV2):
             ytdl_opts["cookiefile"] = cookiefile_path
 
         url = self.song_get_web_url(song)
-        with _NoCookieSaveYoutubeDL(ytdl_opts) as inner:
-            info = inner.extract_info(url, download=False)
+        with self._ytdlp_pool.extractor(ytdl_opts) as inner:
+            with metrics.timed("ytdlp.extract_info"):
+                info = inner.extract_info(url, download=False)
         media_url = info.get("url")
         if not media_url:
             return None
@@ -446,9 +735,54 @@ class YtmusicProvider(AbstractProvider, ProviderV2):
             http_proxy=self._http_proxy,
         )
 
+    def _song_media_cache_key(self, song, quality) -> tuple:
+        # Stream urls are bound to the client ip and the signed-in account.
+        return (
+            song.identifier,
+            getattr(quality, "value", quality),
+            self.service.account_key(),
+            self._http_proxy,
+        )
+
     def song_get_media(
         self, song: SongModel, quality: Quality.Audio
     ) -> Optional[Media]:
+        cache_key = self._song_media_cache_key(song, quality)
+        media = self._media_cache.get(cache_key)
+        if media is not None:
+            return media
+        pending = self._media_prefetcher.get_pending(cache_key)
+        if pending is not None and not pending.cancelled():
+            # The song is being prefetched, wait for it instead of starting
+            # another extraction. Extract again if the prefetch failed.
+            try:
+                return pending.result()
+            except Exception:
+                pass
+        return self._resolve_song_media(song, cache_key)
+
+    def _check_cached_media(self, media: Media) -> bool:
+        """Check the stream urls of a cached media which is about to be played.
+
+        It is only called by the prefetcher, so playback never waits for it.
+        When the server rejects an url, the service emits stream_url_forbidden
+        and the media is dropped from the cache.
+        """
+        for url in media_urls(media):
+            try:
+                if not self.service.check_stream_url(url):
+                    return False
+            except Exception as e:
+                # Let the player try the url, it may still work.
+                logger.debug("check stream url failed: %s", e)
+        return True
+
+    def media_loading_failed(self, media: Media):
+        """Drop a media which the player failed to load from the media cache."""
+        for url in media_urls(media):
+            self._media_cache.invalidate_url(url)
+
+    def _resolve_song_media(self, song: SongModel, cache_key: tuple) -> Media:
         try:
             media = self._song_get_media_from_ytdlp(song)
         except DownloadError as e:
@@ -458,12 +792,89 @@ class YtmusicProvider(AbstractProvider, ProviderV2):
                 provider=self,
             )
         if media is not None:
+            self._media_cache.set(cache_key, media)
             return media
         raise ProviderIOError(
             "failed to resolve media url from yt-dlp",
             provider=self,
         )
 
+    def _prefetch_song_media(self, song: SongModel, quality: Quality.Audio) -> Media:
+        cache_key = self._song_media_cache_key(song, quality)
+        media = self._media_cache.get(cache_key)
+        if media is not None and self._check_cached_media(media):
+            return media
+        return self._resolve_song_media(song, cache_key)
+
+    def song_prefetch_media(
+        self,
+        songs: List[SongModel],
+        quality: Quality.Audio = Quality.Audio.sq,
+        limit: Optional[int] = None,
+    ):
+        """Resolve media of the upcoming songs in background.
+
+        The player is supposed to call this with its upcoming songs whenever
+        the play queue changes. Pending jobs for songs which are no longer in
+        the list are cancelled.
+        """
+        limit = self.PREFETCH_MEDIA_LIMIT if limit is None else limit
+        return self._media_prefetcher.prefetch(list(songs)[:limit], quality)
+
+    def song_list_media(
+        self,
+        songs: List[SongModel],
+        quality: Quality.Audio = Quality.Audio.sq,
+        max_workers: int = 4,
+        timeout: Optional[float] = 60,
+    ) -> List[SongMediaResult]:
+        """Resolve media of many songs concurrently.
+
+        One failure does not abort the batch: each result carries either the
+        media or the error, in the order of `songs`. A song whose extraction
+        runs longer than `timeout` seconds is reported with a TimeoutError.
+        """
+        results = [SongMediaResult(song) for song in songs]
+        if not results:
+            return results
+        started_at = {}
+
+        def resolve(index):
+            started_at[index] = time.monotonic()
+            return self.song_get_media(songs[index], quality)
+
+        executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="ytmusic-batch"
+        )
+        futures = {executor.submit(resolve, i): i for i in range(len(songs))}
+        pending = set(futures)
+        try:
+            while pending:
+                done, pending = wait(pending, timeout=0.1, return_when=FIRST_COMPLETED)
+                for future in done:
+                    result = results[futures[future]]
+                    try:
+                        result.media = future.result()
+                    except Exception as e:
+                        result.error = e
+                if timeout is None:
+                    continue
+                now = time.monotonic()
+                for future in list(pending):
+                    index = futures[future]
+                    if index in started_at and now - started_at[index] > timeout:
+                        # The extraction can not be interrupted; just stop
+                        # waiting for it. Its media still goes to the cache.
+                        results[index].error = TimeoutError(
+                            f"resolve media timed out after {timeout}s"
+                        )
+                        pending.discard(future)
+        finally:
+            for future in pending:
+                future.cancel()
+            executor.shutdown(wait=False)
+        return results
+
     def song_get_web_url(self, song) -> str:
         return f"https://music.youtube.com/watch?v={song.identifier}"
 
@@ -472,7 +883,9 @@ class YtmusicProvider(AbstractProvider, ProviderV2):
         # hack(cosven): we use get_watch_playlist to try to get song detail.
         # It works for song like '如愿-王菲'.
         result = self.service.api.get_watch_playlist(identifier)
-        songs = [YtmusicWatchPlaylistSong(**track).v2_model() for track in result["tracks"]]
+        songs = [
+            YtmusicWatchPlaylistSong(**track).v2_model() for track in result["tracks"]
+        ]
         for song in songs:
             if song.identifier == identifier:
                 return song
@@ -519,24 +932,22 @@ class YtmusicProvider(AbstractProvider, ProviderV2):
     #     return self.remove_playlist_item(self.identifier, song_id, set_id)
 
     def artist_create_songs_rd(self, artist):
-        artist_info = self.service.artist_info(artist.identifier)
-        if artist_info.songs.browseId is None:
+        page = self.service.artist_page(
+            artist.identifier, albums=False, singles=False
+        )
+        if page.songs is None:
             # results may also be none.
             # for example: channelId=UCGSXa1Ve1FswQxtwarGi-Vg
-            return [song.v2_model() for song in artist_info.songs.results or []]
-        playlist_info = self.service.playlist_info(artist_info.songs.browseId)
-        return playlist_info.reader(self)
+            songs = page.info.songs.results if page.info.songs is not None else None
+            return [song.v2_model() for song in songs or []]
+        return page.songs.reader(self)
 
     def artist_create_albums_rd(self, artist):
-        artist_info = self.service.artist_info(artist.identifier)
-        # Sometimes, the artist only has few albums, read them from results.
-        if artist_info.albums.browseId is None:
-            albums = artist_info.albums.results
-        else:
-            albums = self.service.artist_albums(
-                artist_info.albums.browseId, artist_info.albums.params
-            )
-        return [album.v2_brief_model() for album in albums]
+        # Sometimes, the artist only has few albums, they are read from results.
+        page = self.service.artist_page(
+            artist.identifier, songs=False, singles=False
+        )
+        return [album.v2_brief_model() for album in page.albums]
 
     def video_list_quality(self, video) -> List[Quality.Video]:
         return [Quality.Video.sd]
@@ -572,34 +983,35 @@ class YtmusicProvider(AbstractProvider, ProviderV2):
 
         audio_candidates = []  # [(url, abr)]  abr: average bitrate
         video_candidates = []  # [(url, width)]
-        with _NoCookieSaveYoutubeDL(ytdl_opts) as inner:
+        with self._ytdlp_pool.extractor(ytdl_opts) as inner:
             try:
-                info = inner.extract_info(url, download=False)
+                with metrics.timed("ytdlp.extract_info"):
+                    info = inner.extract_info(url, download=False)
             except DownloadError as e:  # noqa
                 logger.warning(f"extract_info failed for {url}")
                 raise ProviderIOError("yt-dlp extract info failed", provider=self)
-            for f in info["formats"]:
-                if f.get("acodec", "none") not in ("none", None):
-                    audio_candidates.append((f["url"], f["abr"]))
-                if f.get("vcodec", "none") not in ("none", None) and f.get(
-                    "protocol", ""
-                ) in ("https", "http"):
-                    video_candidates.append((f["url"], f["width"]))
-            if not (audio_candidates and video_candidates):
-                return None
-            audio_candidates = sorted(
-                audio_candidates, key=lambda c: c[1] or 0, reverse=True
-            )
-            video_candidates = sorted(
-                video_candidates, key=lambda c: c[1] or 0, reverse=True
-            )
-            # always use the best audio(with highest bitrate)
-            audio_url = audio_candidates[0][0]
-            # TODO: use policy on video because high-quality video may be slow
-            video_url = video_candidates[0][0]
-            return Media(
-                VideoAudioManifest(video_url, audio_url), http_proxy=self._http_proxy
-            )
+        for f in info["formats"]:
+            if f.get("acodec", "none") not in ("none", None):
+                audio_candidates.append((f["url"], f["abr"]))
+            if f.get("vcodec", "none") not in ("none", None) and f.get(
+                "protocol", ""
+            ) in ("https", "http"):
+                video_candidates.append((f["url"], f["width"]))
+        if not (audio_candidates and video_candidates):
+            return None
+        audio_candidates = sorted(
+            audio_candidates, key=lambda c: c[1] or 0, reverse=True
+        )
+        video_candidates = sorted(
+            video_candidates, key=lambda c: c[1] or 0, reverse=True
+        )
+        # always use the best audio(with highest bitrate)
+        audio_url = audio_candidates[0][0]
+        # TODO: use policy on video because high-quality video may be slow
+        video_url = video_candidates[0][0]
+        return Media(
+            VideoAudioManifest(video_url, audio_url), http_proxy=self._http_proxy
+        )
 
     def song_get_mv(self, song: BriefSongProtocol) -> BriefVideoModel:
         return BriefVideoModel(
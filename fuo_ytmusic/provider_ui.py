@@ -9,13 +9,16 @@ from feeluown.utils.dispatch import Signal
 
 from fuo_ytmusic.consts import HEADER_FILE
 from fuo_ytmusic.headerfile import write_headerfile
+from fuo_ytmusic.metrics import metrics
 from fuo_ytmusic.provider import provider
 from fuo_ytmusic.qt_compat import (
     Dialog,
+    QDialog,
     QFormLayout,
     QInputDialog,
     QLabel,
     QLineEdit,
+    QPlainTextEdit,
     QPushButton,
     QVBoxLayout,
     TextSelectableByMouse,
@@ -39,6 +42,8 @@ class ProviderUI(AbstractProviderUi):
     def context_menu_add_items(self, menu):
         action = menu.addAction("Switch account")
         action.triggered.connect(lambda: aio.run_afn_ref(self.switch_profile_dialog))
+        action = menu.addAction("Show metrics")
+        action.triggered.connect(self.show_metrics_dialog)
 
     def login_or_go_home(self):
         if not provider.has_current_user():
@@ -57,6 +62,10 @@ class ProviderUI(AbstractProviderUi):
         del self._dialog
         self.login_event.emit(self, 1)
 
+    def show_metrics_dialog(self):
+        self._metrics_dialog = MetricsDialog(self._app)
+        self._metrics_dialog.show()
+
     async def switch_profile_dialog(self):
         if not provider.has_current_user():
             self._app.show_msg("Please log in before switching accounts.")
@@ -102,6 +111,33 @@ class ProviderUI(AbstractProviderUi):
         self.login_event.emit(self, 2)
 
 
+class MetricsDialog(QDialog):
+    """Show the metrics in Prometheus text format, refreshed on demand."""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("YouTube Music metrics")
+        self._text = QPlainTextEdit()
+        self._text.setReadOnly(True)
+        self._refresh_btn = QPushButton("Refresh")
+        self._reset_btn = QPushButton("Reset")
+        self._refresh_btn.clicked.connect(self.refresh)
+        self._reset_btn.clicked.connect(self.reset)
+        layout = QVBoxLayout(self)
+        layout.addWidget(self._text)
+        layout.addWidget(self._refresh_btn)
+        layout.addWidget(self._reset_btn)
+        self.resize(640, 480)
+        self.refresh()
+
+    def refresh(self):
+        self._text.setPlainText(metrics.prometheus_text())
+
+    def reset(self):
+        metrics.reset()
+        self.refresh()
+
+
 class LoginDialog(LoginDialog_):
     def __init__(self, provider):
         super().__init__()
@@ -22,6 +22,7 @@ QFormLayout = QtWidgets.QFormLayout
 QFileDialog = QtWidgets.QFileDialog
 QMessageBox = QtWidgets.QMessageBox
 QInputDialog = QtWidgets.QInputDialog
+QPlainTextEdit = QtWidgets.QPlainTextEdit
 
 pyqtSignal = QtCore.pyqtSignal
 
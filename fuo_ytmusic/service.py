@@ -1,28 +1,67 @@
+import hashlib
+import json
 import logging
 import ntpath
 import os
 import sys
 import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import timedelta
 from enum import Enum
 from functools import partial
 from http.cookies import SimpleCookie
-from typing import List, Optional, Union
+from typing import List, Optional, Tuple, Union
 
 import requests
 from cachetools.func import ttl_cache
 from feeluown.library import SearchType
-from requests import Response
+from feeluown.utils.dispatch import Signal
 from ytmusicapi import YTMusic as YTMusicBase
+from ytmusicapi.continuations import (
+    CONTINUATION_ITEMS,
+    get_continuation_contents,
+    get_continuation_params,
+    get_continuation_token,
+)
+from ytmusicapi.navigation import (
+    CONTENT,
+    GRID,
+    MRLIR,
+    MUSIC_SHELF,
+    SECTION,
+    SECTION_LIST,
+    SINGLE_COLUMN_TAB,
+    TITLE_TEXT,
+    TWO_COLUMN_RENDERER,
+    nav,
+)
+from ytmusicapi.parsers.browsing import (
+    parse_content_list,
+    parse_mixed_content,
+    parse_playlist,
+)
+from ytmusicapi.parsers.library import (
+    get_library_contents,
+    parse_albums,
+    parse_artists,
+    pop_songs_random_mix,
+)
+from ytmusicapi.parsers.playlists import parse_playlist_items
+from ytmusicapi.parsers.search import get_search_params, parse_search_results
 from ytmusicapi.ytmusic import OAuthCredentials
 
+from fuo_ytmusic.cache import LruTtlCache, scoped_cache, single_flight
+from fuo_ytmusic.disk_cache import YtmusicDiskCache
 from fuo_ytmusic.headerfile import (
     update_headerfile_cookie,
 )
 from fuo_ytmusic.helpers import Singleton
+from fuo_ytmusic.metrics import metrics
 from fuo_ytmusic.models import (
     AlbumInfo,
     ArtistInfo,
+    ArtistPage,
     Categories,
     PlaylistAddItemResponse,
     PlaylistInfo,
@@ -41,10 +80,25 @@ from fuo_ytmusic.models import (
     YtmusicSearchVideo,
 )
 from fuo_ytmusic.profile import YtmusicProfileManager
+from fuo_ytmusic.transport import YtmusicRequestRecord, YtmusicSession
+from fuo_ytmusic.typeahead import YtmusicTypeahead
 
 CACHE_TTL = timedelta(minutes=10).seconds
-CACHE_SIZE = 1
+# Search results go stale quickly, keep them just long enough for going back
+# to the search page or switching result tabs.
+SEARCH_CACHE_TTL = timedelta(minutes=2).seconds
+HOME_SECTIONS_CACHE_TTL = 30
+# Same as the ttl of home_sections; home continuations expire quickly.
+HOME_PAGE_CACHE_TTL = HOME_SECTIONS_CACHE_TTL
+# Disk cache entries younger than DISK_CACHE_FRESH_TTL are served as is. Older
+# ones are served and refreshed in background, until DISK_CACHE_MAX_AGE.
+DISK_CACHE_FRESH_TTL = CACHE_TTL
+DISK_CACHE_MAX_AGE = timedelta(days=7).total_seconds()
 GLOBAL_LIMIT = 20
+# The session timeout is tuned for API calls; the server may take longer to
+# answer once an upload is finalized.
+UPLOAD_TIMEOUT = 60
+STREAM_URL_CHECK_TIMEOUT = 2
 
 logger = logging.getLogger(__name__)
 
@@ -78,6 +132,48 @@ class YtmusicScope(Enum):
     up = "uploads"
 
 
+class YtmusicLibraryKind(Enum):
+    songs = "songs"
+    albums = "albums"
+    subscriptions = "subscriptions"
+    playlists = "playlists"
+
+
+# kind -> (browseId, renderer, continuation type, parse function)
+_LIBRARY_PAGES = {
+    YtmusicLibraryKind.songs: (
+        "FEmusic_liked_videos",
+        MUSIC_SHELF,
+        "musicShelfContinuation",
+        parse_playlist_items,
+    ),
+    YtmusicLibraryKind.albums: (
+        "FEmusic_liked_albums",
+        GRID,
+        "gridContinuation",
+        parse_albums,
+    ),
+    YtmusicLibraryKind.subscriptions: (
+        "FEmusic_library_corpus_artists",
+        MUSIC_SHELF,
+        "musicShelfContinuation",
+        parse_artists,
+    ),
+    YtmusicLibraryKind.playlists: (
+        "FEmusic_liked_playlists",
+        GRID,
+        "gridContinuation",
+        lambda items: parse_content_list(items, parse_playlist),
+    ),
+}
+_LIBRARY_MODELS = {
+    YtmusicLibraryKind.songs: YtmusicLibrarySong,
+    YtmusicLibraryKind.albums: YtmusicSearchAlbum,
+    YtmusicLibraryKind.subscriptions: YtmusicLibraryArtist,
+    YtmusicLibraryKind.playlists: PlaylistNestedResult,
+}
+
+
 class YTMusic(YTMusicBase):
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
@@ -100,6 +196,164 @@ class YTMusic(YTMusicBase):
     def send_api_request(self, endpoint: str, body: dict):
         return self._send_request(endpoint, body)
 
+    def get_playlist_page(
+        self, playlist_id: str, continuation: Optional[str] = None
+    ) -> Tuple[list, Optional[str]]:
+        """Fetch a single page of playlist tracks.
+
+        Unlike get_playlist, the continuation token of the page is returned,
+        so the caller can fetch the next slice without starting over.
+        """
+        if continuation:
+            response = self._send_request("browse", {"continuation": continuation})
+            contents = nav(response, CONTINUATION_ITEMS, True)
+        else:
+            browse_id = (
+                playlist_id if playlist_id.startswith("VL") else "VL" + playlist_id
+            )
+            response = self._send_request("browse", {"browseId": browse_id})
+            contents = nav(
+                response,
+                [
+                    *TWO_COLUMN_RENDERER,
+                    "secondaryContents",
+                    *SECTION,
+                    *CONTENT,
+                    "musicPlaylistShelfRenderer",
+                    "contents",
+                ],
+                True,
+            )
+            if contents is None:
+                # Audio playlists (OLA...) have a different layout, let
+                # ytmusicapi parse them in one go.
+                return self.get_playlist(playlist_id, None).get("tracks") or [], None
+        if not contents:
+            return [], None
+        return parse_playlist_items(contents), get_continuation_token(contents)
+
+    def get_library_page(
+        self, kind: YtmusicLibraryKind, continuation: Optional[str] = None
+    ) -> Tuple[list, Optional[str]]:
+        """Fetch a single page of the user's library.
+
+        Like get_playlist_page, it mirrors the get_library_* methods of
+        ytmusicapi, but returns the continuation instead of following it.
+        """
+        self._check_auth()
+        browse_id, renderer, continuation_type, parse = _LIBRARY_PAGES[kind]
+        body = {"browseId": browse_id}
+        if continuation:
+            response = self._send_request("browse", body, continuation)
+            results = nav(response, ["continuationContents", continuation_type], True)
+        else:
+            response = self._send_request("browse", body)
+            results = get_library_contents(response, renderer)
+            if results is not None:
+                if kind is YtmusicLibraryKind.songs:
+                    pop_songs_random_mix(results)
+                elif kind is YtmusicLibraryKind.playlists:
+                    # The first grid item is the "New playlist" button.
+                    results["items"] = results.get("items", [])[1:]
+        if results is None:
+            return [], None
+        items = get_continuation_contents(results, parse)
+        if not items or "continuations" not in results:
+            return items, None
+        return items, get_continuation_params(results)
+
+    def get_home_page(
+        self, continuation: Optional[str] = None
+    ) -> Tuple[list, Optional[str]]:
+        """Fetch a single page of home sections.
+
+        Like get_library_page, it mirrors get_home of ytmusicapi, but returns
+        the continuation instead of following it until the limit is reached.
+        """
+        body = {"browseId": "FEmusic_home"}
+        if continuation:
+            response = self._send_request("browse", body, continuation)
+            section_list = nav(
+                response, ["continuationContents", "sectionListContinuation"], True
+            )
+        else:
+            response = self._send_request("browse", body)
+            section_list = nav(
+                response, [*SINGLE_COLUMN_TAB, "sectionListRenderer"], True
+            )
+        if not section_list:
+            return [], None
+        sections = parse_mixed_content(section_list.get("contents", []))
+        if "continuations" not in section_list:
+            return sections, None
+        return sections, get_continuation_params(section_list)
+
+    def search_page(
+        self,
+        query: str,
+        filter: str,
+        scope: Optional[str] = None,
+        continuation: Optional[str] = None,
+    ) -> Tuple[list, Optional[str]]:
+        """Fetch a single page of filtered search results.
+
+        YouTube Music only paginates search results when a filter is set.
+        Like get_library_page, the continuation of the page is returned
+        instead of being followed, so deep searches are fetched on demand.
+        """
+        body = {"query": query}
+        params = get_search_params(filter, scope, False)
+        if params:
+            body["params"] = params
+        if scope == "uploads":
+            result_type = "upload"
+        else:
+            result_type = "playlist" if "playlists" in filter else filter[:-1]
+        category = None
+        if continuation:
+            response = self._send_request("search", body, continuation)
+            shelf = nav(
+                response, ["continuationContents", "musicShelfContinuation"], True
+            )
+        else:
+            response = self._send_request("search", body)
+            contents = response.get("contents")
+            if contents is None:
+                return [], None
+            if "tabbedSearchResultsRenderer" in contents:
+                contents = contents["tabbedSearchResultsRenderer"]["tabs"][0][
+                    "tabRenderer"
+                ]["content"]
+            shelf, category = self._search_shelf(
+                nav(contents, SECTION_LIST, True) or [], result_type, scope
+            )
+        if not shelf or not shelf.get("contents"):
+            return [], None
+        items = parse_search_results(shelf["contents"], result_type, category)
+        if not items or "continuations" not in shelf:
+            return items, None
+        return items, get_continuation_params(shelf)
+
+    @staticmethod
+    def _search_shelf(sections: list, result_type: str, scope: Optional[str]):
+        """Pick the shelf which holds the filtered results, like ytmusicapi.
+
+        Shelves of other items are skipped, and so is a shelf whose title
+        names another category, e.g. the songs YouTube Music pads a playlist
+        search with. Titles are localized, so the first shelf of list items
+        is used when no title matches.
+        """
+        shelves = []
+        for section in sections:
+            shelf = section.get("musicShelfRenderer")
+            if not shelf or MRLIR not in (shelf.get("contents") or [{}])[0]:
+                continue
+            category = nav(shelf, TITLE_TEXT, True)
+            if scope == "uploads" or (category and result_type in category.lower()):
+                return shelf, category
+            shelves.append((shelf, category))
+        return shelves[0] if shelves else (None, None)
+
     def request_with_auth(
         self, method: str, url: str, origin: str = None, json_body=None
     ):
@@ -194,17 +448,23 @@ class YTMusic(YTMusicBase):
         headers["X-Goog-Upload-Command"] = "start"
         headers["X-Goog-Upload-Header-Content-Length"] = str(filesize)
         headers["X-Goog-Upload-Protocol"] = "resumable"
-        response = requests.post(
-            upload_url, data=body, headers=headers, proxies=self.proxies
+        # Go through the session, so the upload host gets its own pool.
+        response = self._session.post(
+            upload_url,
+            data=body,
+            headers=headers,
+            proxies=self.proxies,
+            timeout=UPLOAD_TIMEOUT,
         )
         headers["X-Goog-Upload-Command"] = "upload, finalize"
         headers["X-Goog-Upload-Offset"] = "0"
         upload_url = response.headers["X-Goog-Upload-URL"]
-        response = requests.post(
+        response = self._session.post(
             upload_url,
             data=YTMusic.IterableToFileAdapter(YTMusic.ChunckedUpload(filepath)),
             headers=headers,
             proxies=self.proxies,
+            timeout=UPLOAD_TIMEOUT,
         )
         if response.status_code == 200:
             return "STATUS_SUCCEEDED"
@@ -212,23 +472,47 @@ class YTMusic(YTMusicBase):
             return response
 
 
+def _search_result_text(item) -> str:
+    """Text which typeahead refinement matches a search result against."""
+    parts = [getattr(item, "title", None), getattr(item, "artist", None)]
+    parts.extend(artist.name for artist in getattr(item, "artists", None) or [])
+    album = getattr(item, "album", None)
+    if album is not None:
+        parts.append(getattr(album, "name", None))
+    return " ".join(part for part in parts if part)
+
+
+def _observe_request(record: YtmusicRequestRecord):
+    error = f"HTTP{record.status}" if record.status >= 400 else None
+    metrics.observe(f"http.{record.endpoint}", record.latency, error)
+
+
 class YtmusicService(metaclass=Singleton):
     def __init__(self):
-        self._session = requests.Session()
+        self._session = YtmusicSession()
         self._api: Optional[YTMusic] = None
-        self._session.hooks["response"].append(self._do_logging)
 
         self._signature_timestamp = 0
         self._api_lock = threading.Lock()
         self._profile_manager = YtmusicProfileManager(self)
         self._language: Optional[str] = None
 
-    @staticmethod
-    def _do_logging(r: Response, *_, **__):
-        logger.debug(
-            f"[ytmusic] Requesting: [{r.request.method.upper()}] {r.url}; "
-            f"Response: [{r.status_code}] {len(r.content)} bytes."
+        self._disk_cache: Optional[YtmusicDiskCache] = None
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._executor_lock = threading.Lock()
+        self._revalidating_keys = set()
+        # Wall clock of the disk cache, whose entries outlive the process.
+        self._timer = time.time
+        # Emitted with the url when a stream url is rejected with 403.
+        self.stream_url_forbidden = Signal()
+        self.typeahead = YtmusicTypeahead(
+            lambda query: self.search(query, None),
+            self._get_executor,
+            text_of=_search_result_text,
+            scope=self._cache_scope,
+            ttl=CACHE_TTL,
         )
+        metrics.add_cache_source("service", self.cache_stats)
 
     @property
     def api(self) -> YTMusic:
@@ -275,6 +559,85 @@ class YtmusicService(metaclass=Singleton):
 
     def setup_language(self, language: str):
         self._language = language
+        self.search.cache_clear()
+
+    def setup_disk_cache(self, path):
+        """Store raw payloads in the SQLite file at path; None disables it."""
+        if self._disk_cache is not None:
+            self._disk_cache.close()
+            self._disk_cache = None
+        if path is None:
+            return
+        try:
+            self._disk_cache = YtmusicDiskCache(path)
+            self._disk_cache.purge(self._timer() - DISK_CACHE_MAX_AGE)
+        except Exception as e:
+            logger.warning("disable ytmusic disk cache, open %s failed: %s", path, e)
+            self._disk_cache = None
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            with self._executor_lock:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(
+                        max_workers=4, thread_name_prefix="ytmusic-service"
+                    )
+        return self._executor
+
+    def _fetch_raw(self, name: str, args: tuple, fetch):
+        """Fetch a raw ytmusicapi payload with stale-while-revalidate semantics.
+
+        A fresh disk entry is returned as is. A stale one is returned at once
+        and refreshed in background. `name` is the service method which parses
+        the payload; its memory cache is dropped once the refresh is done.
+        """
+        disk_cache = self._disk_cache
+        if disk_cache is None:
+            return fetch()
+        scope = self._cache_scope()
+        key = json.dumps([name, scope, list(args)])
+        entry = disk_cache.get(key)
+        now = self._timer()
+        if entry is None or now - entry[1] > DISK_CACHE_MAX_AGE:
+            payload = fetch()
+            disk_cache.set(key, payload, stored_at=now)
+            return payload
+        payload, stored_at = entry
+        if now - stored_at > DISK_CACHE_FRESH_TTL:
+            self._revalidate(name, args, key, scope, fetch)
+        return payload
+
+    def _revalidate(
+        self, name: str, args: tuple, key: str, scope, fetch
+    ) -> Optional[Future]:
+        with self._executor_lock:
+            if key in self._revalidating_keys:
+                return None
+            self._revalidating_keys.add(key)
+
+        def refresh():
+            try:
+                payload = fetch()
+            except Exception as e:
+                logger.warning("revalidate ytmusic %s failed: %s", name, e)
+                return
+            finally:
+                with self._executor_lock:
+                    self._revalidating_keys.discard(key)
+            disk_cache = self._disk_cache
+            # The profile or language may change while refreshing.
+            if disk_cache is None or self._cache_scope() != scope:
+                return
+            disk_cache.set(key, payload, stored_at=self._timer())
+            # Drop the entry parsed from the stale payload. Entries of other
+            # arguments were not revalidated and stay.
+            method = getattr(type(self), name, None)
+            if hasattr(method, "cache_key"):
+                method.cache.pop(method.cache_key(self, *args))
+            elif hasattr(method, "cache_clear"):
+                method.cache_clear()
+
+        return self._get_executor().submit(refresh)
 
     def setup_http_proxy(self, http_proxy):
         self._session.proxies = {
@@ -282,6 +645,41 @@ class YtmusicService(metaclass=Singleton):
             "https": http_proxy,
         }
 
+    def setup_http_pool(self, pool_maxsize: int):
+        """Set how many connections to music.youtube.com are kept open."""
+        self._session.configure_host("music.youtube.com", pool_maxsize=pool_maxsize)
+
+    def setup_http_metrics(self, enabled: bool):
+        """Record the latency and errors of each request in `metrics`.
+
+        Off by default: without an observer, YtmusicSession does not measure
+        requests at all.
+        """
+        observers = self._session.observers
+        if enabled and _observe_request not in observers:
+            observers.append(_observe_request)
+        elif not enabled and _observe_request in observers:
+            observers.remove(_observe_request)
+
+    def setup_http2(self, enabled: bool) -> bool:
+        """Send InnerTube calls over HTTP/2; return whether it is in use.
+
+        HTTP/2 needs optional dependencies. Without them, a warning is logged
+        and HTTP/1.1 is kept.
+        """
+        if not enabled:
+            self._session.disable_http2()
+            return False
+        try:
+            self._session.enable_http2()
+        except ImportError as e:
+            logger.warning("ytmusic HTTP/2 is unavailable: %s", e)
+            return False
+        return True
+
+    def pool_stats(self) -> dict:
+        return self._session.pool_stats()
+
     def setup_timeout(self, timeout):
         if isinstance(self._session.request, partial):
             request = self._session.request.func
@@ -289,6 +687,7 @@ class YtmusicService(metaclass=Singleton):
             request = self._session.request
         self._session.request = partial(request, timeout=timeout)
 
+    @scoped_cache(maxsize=64, ttl=SEARCH_CACHE_TTL)
     def search(
         self,
         keywords: str,
@@ -313,6 +712,21 @@ class YtmusicService(metaclass=Singleton):
         )
         return [YtmusicDispatcher.search_result_dispatcher(**data) for data in response]
 
+    @single_flight
+    def search_page(
+        self,
+        keywords: str,
+        t: YtmusicType,
+        scope: YtmusicScope = None,
+        continuation: Optional[str] = None,
+    ) -> Tuple[list, Optional[str]]:
+        """Return one page of search results of type t and the next continuation."""
+        items, next_continuation = self.api.search_page(
+            keywords, t.value, None if scope is None else scope.value, continuation
+        )
+        results = [YtmusicDispatcher.search_result_dispatcher(**data) for data in items]
+        return results, next_continuation
+
     def _daily_home_cache_key(self) -> str:
         context = getattr(self.api, "context", {})
         if not isinstance(context, dict):
@@ -322,13 +736,64 @@ class YtmusicService(metaclass=Singleton):
             return ""
         return str(user_ctx.get("onBehalfOfUser") or "")
 
-    @ttl_cache(maxsize=8, ttl=30)
+    def _cache_scope(self) -> Tuple[str, str, str]:
+        # Responses depend on the language, the signed-in account and the
+        # active profile.
+        return self._language or "", *self._account_scope()
+
+    def _account_scope(self) -> Tuple[str, str]:
+        # Keys built from it may be persisted, so hash the account.
+        sapisid = getattr(self._api, "sapisid", None)
+        account = hashlib.sha1(sapisid.encode()).hexdigest()[:16] if sapisid else ""
+        return account, self._daily_home_cache_key()
+
+    def account_key(self) -> str:
+        """Identify the signed-in account and profile, e.g. for local data."""
+        return ":".join(self._account_scope())
+
+    def setup_cache(
+        self, name: str, maxsize: Optional[int] = None, ttl: Optional[float] = None
+    ):
+        """Change capacity and/or ttl of a cached method, such as `artist_info`."""
+        cache = getattr(getattr(type(self), name, None), "cache", None)
+        if not isinstance(cache, LruTtlCache):
+            raise ValueError(f"{name} is not a cached method")
+        cache.configure(maxsize=maxsize, ttl=ttl)
+
+    def cache_stats(self) -> dict:
+        stats = {}
+        for name in dir(type(self)):
+            cache = getattr(getattr(type(self), name), "cache", None)
+            if isinstance(cache, LruTtlCache):
+                stats[name] = cache.stats()
+        return stats
+
+    @ttl_cache(maxsize=8, ttl=HOME_SECTIONS_CACHE_TTL)
     def _home_sections_cached(self, limit: int, account_key: str):
-        return self.api.get_home(limit)
+        return self._fetch_raw(
+            "_home_sections_cached", (limit,), lambda: self.api.get_home(limit)
+        )
 
     def home_sections(self, limit: int = 12):
         return self._home_sections_cached(limit, self._daily_home_cache_key())
 
+    @scoped_cache(maxsize=8, ttl=HOME_PAGE_CACHE_TTL)
+    def home_page(
+        self, continuation: Optional[str] = None
+    ) -> Tuple[list, Optional[str]]:
+        """Return one page of raw home sections and the next continuation.
+
+        The first page is kept in the disk cache, so the home screen renders
+        from disk. Its continuation may have expired by then, in which case
+        requesting the next page fails until the page is revalidated.
+        """
+        if continuation is not None:
+            return self.api.get_home_page(continuation)
+        sections, next_continuation = self._fetch_raw(
+            "home_page", (continuation,), lambda: list(self.api.get_home_page())
+        )
+        return sections, next_continuation
+
     def get_current_account_info(self) -> dict:
         return self._profile_manager.get_current_account_info()
 
@@ -336,88 +801,162 @@ class YtmusicService(metaclass=Singleton):
         return self._profile_manager.list_profiles()
 
     def switch_profile(self, account_name: str = None, gaia_id: str = None) -> dict:
+        # Results are scoped by profile anyway; drop the old profile's ones.
+        self.search.cache_clear()
         return self._profile_manager.switch_profile(
             account_name=account_name, gaia_id=gaia_id
         )
 
-    @ttl_cache(maxsize=CACHE_SIZE, ttl=CACHE_TTL)
+    @scoped_cache(maxsize=32, ttl=CACHE_TTL)
     def artist_info(self, channel_id: str) -> ArtistInfo:
-        data = self.api.get_artist(channel_id)
+        data = self._fetch_raw(
+            "artist_info", (channel_id,), lambda: self.api.get_artist(channel_id)
+        )
         return ArtistInfo(**data)
 
-    @ttl_cache(maxsize=CACHE_SIZE, ttl=CACHE_TTL)
+    @scoped_cache(maxsize=16, ttl=CACHE_TTL)
     def artist_albums(self, channel_id: str, params: str) -> List[YtmusicSearchAlbum]:
         response = self.api.get_artist_albums(channel_id, params)
-        return [YtmusicSearchAlbum(**data) for data in response]
+        return YtmusicSearchAlbum.parse_list(response)
 
-    @ttl_cache(maxsize=CACHE_SIZE, ttl=CACHE_TTL)
+    def artist_page(
+        self,
+        channel_id: str,
+        songs: bool = True,
+        albums: bool = True,
+        singles: bool = True,
+    ) -> ArtistPage:
+        """Fetch the artist info and then its songs, albums and singles.
+
+        The follow-up requests only depend on the artist info, so they are
+        sent concurrently. Each of them goes through its own method cache,
+        so readers which call e.g. `playlist_info` later get a cache hit.
+        A section whose flag is false is neither fetched nor waited for.
+        """
+        info = self.artist_info(channel_id)
+        executor = self._get_executor()
+
+        def _albums(section):
+            if section is None:
+                return []
+            if section.browseId is None:
+                return section.results or []
+            return self.artist_albums(section.browseId, section.params)
+
+        songs_future = albums_future = singles_future = None
+        if songs and info.songs is not None and info.songs.browseId is not None:
+            songs_future = executor.submit(self.playlist_info, info.songs.browseId)
+        if albums:
+            albums_future = executor.submit(_albums, info.albums)
+        if singles:
+            singles_future = executor.submit(_albums, info.singles)
+        return ArtistPage(
+            info=info,
+            songs=songs_future.result() if songs_future is not None else None,
+            albums=albums_future.result() if albums_future is not None else None,
+            singles=singles_future.result() if singles_future is not None else None,
+        )
+
+    @scoped_cache(maxsize=16, ttl=CACHE_TTL)
     def user_info(self, channel_id: str) -> UserInfo:
         return UserInfo(**self.api.get_user(channel_id))
 
+    @single_flight
     def user_playlists(self, channel_id: str, params: str):
         return self.api.get_user_playlists(channel_id, params)
 
-    @ttl_cache(maxsize=CACHE_SIZE, ttl=CACHE_TTL)
+    @scoped_cache(maxsize=32, ttl=CACHE_TTL)
     def album_info(self, browse_id: str) -> AlbumInfo:
-        data = self.api.get_album(browse_id)
+        data = self._fetch_raw(
+            "album_info", (browse_id,), lambda: self.api.get_album(browse_id)
+        )
         return AlbumInfo(**data)
 
+    @single_flight
     def song_info(self, video_id: str) -> SongInfo:
         return SongInfo(**self.api.get_song(video_id, self.get_signature_timestamp()))
 
-    @ttl_cache(maxsize=CACHE_SIZE, ttl=CACHE_TTL)
+    @scoped_cache(maxsize=2, ttl=CACHE_TTL)
     def categories(self) -> List[Categories]:
-        return [
-            Categories(key=k, value=v)
-            for k, v in self.api.get_mood_categories().items()
-        ]
+        response = self._fetch_raw(
+            "categories", (), lambda: self.api.get_mood_categories()
+        )
+        return [Categories(key=k, value=v) for k, v in response.items()]
 
-    @ttl_cache(maxsize=CACHE_SIZE, ttl=CACHE_TTL)
+    @scoped_cache(maxsize=16, ttl=CACHE_TTL)
     def category_playlists(self, params: str) -> List[PlaylistNestedResult]:
         response = self.api.get_mood_playlists(params)
-        return [PlaylistNestedResult(**data) for data in response]
+        return PlaylistNestedResult.parse_list(response)
 
-    @ttl_cache(maxsize=CACHE_SIZE, ttl=CACHE_TTL)
+    @scoped_cache(maxsize=4, ttl=CACHE_TTL)
     def get_charts(self, country: str = "ZZ") -> dict:
-        response = self.api.get_charts(country)
+        response = self._fetch_raw(
+            "get_charts", (country,), lambda: self.api.get_charts(country)
+        )
         return response if isinstance(response, dict) else {}
 
+    # The library changes with the user's own edits, so it is not cached; the
+    # sidebar lists it twice when it loads, and those calls share one request.
+    @single_flight
     def library_playlists(
         self, limit: int = GLOBAL_LIMIT
     ) -> List[PlaylistNestedResult]:
         response = self.api.get_library_playlists(limit)
-        return [PlaylistNestedResult(**data) for data in response]
+        return PlaylistNestedResult.parse_list(response)
 
+    @single_flight
     def library_songs(self, limit: int = GLOBAL_LIMIT) -> List[YtmusicLibrarySong]:
         response = self.api.get_library_songs(limit)
-        return [YtmusicLibrarySong(**data) for data in response]
+        return YtmusicLibrarySong.parse_list(response)
 
+    @single_flight
     def library_albums(self, limit: int = GLOBAL_LIMIT) -> List[YtmusicSearchAlbum]:
         response = self.api.get_library_albums(limit)
-        return [YtmusicSearchAlbum(**data) for data in response]
+        return YtmusicSearchAlbum.parse_list(response)
 
+    @single_flight
     def library_artists(self, limit: int = GLOBAL_LIMIT) -> List[YtmusicLibraryArtist]:
         response = self.api.get_library_artists(limit)
-        return [YtmusicLibraryArtist(**data) for data in response]
+        return YtmusicLibraryArtist.parse_list(response)
 
+    @single_flight
     def library_subscription_artists(
         self, limit: int = GLOBAL_LIMIT
     ) -> List[YtmusicLibraryArtist]:
         response = self.api.get_library_subscriptions(limit)
-        return [YtmusicLibraryArtist(**data) for data in response]
+        return YtmusicLibraryArtist.parse_list(response)
 
-    @ttl_cache(maxsize=CACHE_SIZE, ttl=CACHE_TTL)
+    @single_flight
+    def library_page(
+        self, kind: YtmusicLibraryKind, continuation: Optional[str] = None
+    ) -> Tuple[list, Optional[str]]:
+        """Return one page of library models and the next continuation."""
+        items, next_continuation = self.api.get_library_page(kind, continuation)
+        return _LIBRARY_MODELS[kind].parse_list(items), next_continuation
+
+    @scoped_cache(maxsize=32, ttl=CACHE_TTL)
     def playlist_info(
         self, playlist_id: str, limit: int = GLOBAL_LIMIT
     ) -> PlaylistInfo:
         return PlaylistInfo(**self.api.get_playlist(playlist_id, limit))
 
+    @single_flight
+    def playlist_tracks_page(
+        self, playlist_id: str, continuation: Optional[str] = None
+    ) -> Tuple[List[YtmusicLibrarySong], Optional[str]]:
+        tracks, next_continuation = self.api.get_playlist_page(
+            playlist_id, continuation
+        )
+        return YtmusicLibrarySong.parse_list(tracks), next_continuation
+
+    @single_flight
     def liked_songs(self, limit: int = GLOBAL_LIMIT) -> PlaylistInfo:
         return PlaylistInfo(**self.api.get_liked_songs(limit))
 
+    @single_flight
     def history(self) -> List[YtmusicHistorySong]:
         response = self.api.get_history()
-        return [YtmusicHistorySong(**data) for data in response]
+        return YtmusicHistorySong.parse_list(response)
 
     def create_playlist(
         self,
@@ -454,19 +993,19 @@ class YtmusicService(metaclass=Singleton):
         self, limit: int = GLOBAL_LIMIT
     ) -> List[YtmusicLibrarySong]:
         response = self.api.get_library_upload_songs(limit)
-        return [YtmusicLibrarySong(**data) for data in response]
+        return YtmusicLibrarySong.parse_list(response)
 
     def library_upload_artists(
         self, limit: int = GLOBAL_LIMIT
     ) -> List[YtmusicLibraryArtist]:
         response = self.api.get_library_upload_artists(limit)
-        return [YtmusicLibraryArtist(**data) for data in response]
+        return YtmusicLibraryArtist.parse_list(response)
 
     def library_upload_albums(
         self, limit: int = GLOBAL_LIMIT
     ) -> List[YtmusicSearchAlbum]:
         response = self.api.get_library_upload_albums(limit)
-        return [YtmusicSearchAlbum(**data) for data in response]
+        return YtmusicSearchAlbum.parse_list(response)
 
     def upload_song(self, file: str) -> str:
         # STATUS_SUCCEEDED
@@ -486,10 +1025,23 @@ class YtmusicService(metaclass=Singleton):
         return None
 
     def check_stream_url(self, url):
-        resp = self._session.head(url)
-        return resp.status_code != 403
+        resp = self._session.head(url, timeout=STREAM_URL_CHECK_TIMEOUT)
+        if resp.status_code == 403:
+            self.stream_url_forbidden.emit(url)
+            return False
+        return True
 
 
+metrics.instrument(
+    YtmusicService,
+    "service",
+    exclude=lambda name: (
+        name.startswith("setup_")
+        or name.endswith("_stats")
+        or name in ("account_key", "get_signature_timestamp")
+    ),
+)
+
 if __name__ == "__main__":
     # noinspection PyUnresolvedReferences
 
@@ -0,0 +1,364 @@
+import logging
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import BaseAdapter, HTTPAdapter
+from urllib3.exceptions import MaxRetryError, ResponseError
+from urllib3.util.retry import Retry
+
+logger = logging.getLogger(__name__)
+
+# Connections of a host which stay unused for this long are closed, so that a
+# later request does not pick a connection the server already dropped.
+MAX_IDLE = 60
+# InnerTube endpoints which only read data. Every InnerTube call is a POST,
+# but edits like playlist/create or like/like must not be sent twice.
+INNERTUBE_READ_ENDPOINTS = frozenset(
+    ["browse", "next", "search", "player", "music/get_search_suggestions"]
+)
+
+
+class InnerTubeRetry(Retry):
+    """Retry which also retries POSTs, but only to the read endpoints.
+
+    urllib3 tells idempotent requests by their method alone. The method is
+    allowed here, and the url is checked once a request failed: a failed
+    edit is only retried when it could not connect, like any other POST.
+    """
+
+    def increment(
+        self,
+        method=None,
+        url=None,
+        response=None,
+        error=None,
+        _pool=None,
+        _stacktrace=None,
+    ):
+        if (
+            method == "POST"
+            and endpoint_name(url or "") not in INNERTUBE_READ_ENDPOINTS
+        ):
+            if error is not None and self._is_read_error(error):
+                raise error.with_traceback(_stacktrace)
+            if error is None and response is not None:
+                if not response.get_redirect_location():
+                    # The server may have applied the edit already.
+                    reason = ResponseError.SPECIFIC_ERROR.format(
+                        status_code=response.status
+                    )
+                    raise MaxRetryError(_pool, url, ResponseError(reason))
+        return super().increment(method, url, response, error, _pool, _stacktrace)
+
+
+# Retry connection failures and transient server errors. Connection errors are
+# retried for any method because the request was not sent.
+INNERTUBE_RETRY = InnerTubeRetry(
+    total=2,
+    backoff_factor=0.3,
+    status_forcelist=(500, 502, 503, 504),
+    allowed_methods=frozenset({"GET", "POST"}),
+    raise_on_status=False,
+)
+
+
+class HostPolicy:
+    """Pool size and retry policy of the hosts which match a suffix."""
+
+    def __init__(
+        self, suffix: str, pool_maxsize: int, max_retries: Optional[Retry] = None
+    ):
+        self.suffix = suffix
+        self.pool_maxsize = pool_maxsize
+        self.max_retries = max_retries
+
+
+# music.youtube.com serves every InnerTube call and the GUI loads several
+# pages at once. googlevideo hosts are hit by stream url checks; each stream
+# lives on its own host, so every pool is small, and a check gets one attempt
+# since re-resolving the media is the fallback anyway. Uploads are not
+# retried, because the resumable upload protocol handles failures by itself.
+DEFAULT_HOST_POLICIES = (
+    HostPolicy("music.youtube.com", pool_maxsize=16, max_retries=INNERTUBE_RETRY),
+    HostPolicy("googlevideo.com", pool_maxsize=4),
+    HostPolicy("upload.youtube.com", pool_maxsize=2),
+)
+
+
+def endpoint_name(url: str) -> str:
+    """Name a request by its InnerTube endpoint, e.g. "browse" or "next".
+
+    Other requests are named by their host, since their paths carry ids.
+    """
+    url_parts = urlsplit(url)
+    path = url_parts.path
+    marker = "/youtubei/v1/"
+    index = path.find(marker)
+    if index != -1:
+        return path[index + len(marker) :]
+    return url_parts.hostname or ""
+
+
+class YtmusicRequestRecord:
+    """Sizes and timings of one request, see `YtmusicSession.observers`."""
+
+    __slots__ = (
+        "method",
+        "url",
+        "endpoint",
+        "status",
+        "ttfb",
+        "latency",
+        "wire_bytes",
+        "body_bytes",
+        "content_encoding",
+    )
+
+    def __init__(self, response: requests.Response, latency: float):
+        self.method = response.request.method
+        self.url = response.url
+        self.endpoint = endpoint_name(response.url)
+        self.status = response.status_code
+        # requests sets elapsed once the response headers are parsed.
+        self.ttfb = response.elapsed.total_seconds()
+        self.latency = latency
+        self.content_encoding = response.headers.get("content-encoding", "")
+        # Bytes received before and after decoding the content encoding. The
+        # body is only measured when it was already read, never read for it:
+        # streamed responses have no body size.
+        self.wire_bytes = getattr(response, "wire_bytes", None)
+        if self.wire_bytes is None and hasattr(response.raw, "tell"):
+            self.wire_bytes = response.raw.tell()
+        self.body_bytes = None
+        if response._content_consumed and isinstance(response._content, bytes):
+            self.body_bytes = len(response._content)
+
+    def as_dict(self) -> dict:
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    def __repr__(self):
+        return (
+            f"<YtmusicRequestRecord {self.method} {self.endpoint} "
+            f"[{self.status}] {self.latency * 1000:.0f}ms>"
+        )
+
+
+class YtmusicHTTPAdapter(HTTPAdapter):
+    """HTTPAdapter which closes the connection pools of idle hosts."""
+
+    def __init__(
+        self,
+        pool_maxsize: int,
+        max_retries: Optional[Retry] = None,
+        max_idle: float = MAX_IDLE,
+        timer: Callable[[], float] = None,
+    ):
+        self.max_idle = max_idle
+        self._timer = timer or time.monotonic
+        # (scheme, host, port) -> when a request was last sent to it.
+        self._last_used: Dict[Tuple[str, str, int], float] = {}
+        self._last_reap = self._timer()
+        self._reap_lock = threading.Lock()
+        self.reaped = 0
+        super().__init__(
+            pool_maxsize=pool_maxsize,
+            max_retries=0 if max_retries is None else max_retries,
+        )
+
+    def send(self, request, *args, **kwargs):
+        now = self._timer()
+        if now - self._last_reap > self.max_idle / 2:
+            self.reap_idle(now)
+        url = urlsplit(request.url)
+        port = url.port or (443 if url.scheme == "https" else 80)
+        self._last_used[(url.scheme, url.hostname or "", port)] = now
+        return super().send(request, *args, **kwargs)
+
+    def reap_idle(self, now: Optional[float] = None) -> int:
+        """Close the pools of hosts idle for max_idle; return how many."""
+        now = self._timer() if now is None else now
+        reaped = 0
+        with self._reap_lock:
+            self._last_reap = now
+            for pools in self._pool_containers():
+                for key in pools.keys():
+                    pool = pools.get(key)
+                    if pool is None:
+                        continue
+                    last_used = self._last_used.get((pool.scheme, pool.host, pool.port))
+                    if last_used is not None and now - last_used <= self.max_idle:
+                        continue
+                    try:
+                        # The container closes the pool when it is removed.
+                        del pools[key]
+                    except KeyError:
+                        continue
+                    reaped += 1
+            self.reaped += reaped
+        return reaped
+
+    def stats(self) -> dict:
+        pools = []
+        for container in self._pool_containers():
+            for key in container.keys():
+                pool = container.get(key)
+                if pool is None:
+                    continue
+                # The queue is filled with None placeholders up to maxsize.
+                queue = list(pool.pool.queue) if pool.pool is not None else []
+                idle = sum(1 for conn in queue if conn is not None)
+                pools.append(
+                    {
+                        "host": pool.host,
+                        "port": pool.port,
+                        "connections": pool.num_connections,
+                        "requests": pool.num_requests,
+                        "idle": idle,
+                    }
+                )
+        return {
+            "pool_maxsize": self._pool_maxsize,
+            "max_retries": self.max_retries.total,
+            "reaped": self.reaped,
+            "pools": pools,
+        }
+
+    def _pool_containers(self):
+        yield self.poolmanager.pools
+        for manager in list(self.proxy_manager.values()):
+            yield manager.pools
+
+
+class YtmusicSession(requests.Session):
+    """requests.Session with a connection pool per kind of host.
+
+    requests picks adapters by url prefix, which can not express hosts like
+    ``rr1---sn-xxx.googlevideo.com``, so https adapters are chosen by host
+    suffix instead. Hosts without a policy use the default adapter. Over
+    HTTP/2, the pool size of a policy is the maximum number of connections.
+    """
+
+    def __init__(self, policies=DEFAULT_HOST_POLICIES, max_idle: float = MAX_IDLE):
+        super().__init__()
+        self.max_idle = max_idle
+        # Called with a YtmusicRequestRecord after each request. Requests are
+        # only measured when there is an observer or debug logging is on.
+        self.observers: List[Callable[[YtmusicRequestRecord], None]] = []
+        self._local = threading.local()
+        self._policies = [
+            HostPolicy(p.suffix, p.pool_maxsize, p.max_retries) for p in policies
+        ]
+        self._host_adapters: Dict[str, BaseAdapter] = {}
+        self._http2_suffixes = set()
+        for policy in self._policies:
+            self._mount_policy(policy)
+
+    def configure_host(
+        self,
+        suffix: str,
+        pool_maxsize: Optional[int] = None,
+        max_retries: Optional[Retry] = None,
+    ):
+        """Change the policy of a host suffix, or add a new one.
+
+        The previous adapter of the suffix is closed; requests in flight on
+        it complete normally.
+        """
+        policy = next((p for p in self._policies if p.suffix == suffix), None)
+        if policy is None:
+            policy = HostPolicy(suffix, pool_maxsize or 10, max_retries)
+            self._policies.append(policy)
+        else:
+            if pool_maxsize is not None:
+                policy.pool_maxsize = pool_maxsize
+            if max_retries is not None:
+                policy.max_retries = max_retries
+        old = self._host_adapters.get(suffix)
+        self._mount_policy(policy)
+        if old is not None:
+            old.close()
+
+    def enable_http2(self, suffix: str = "music.youtube.com"):
+        """Send the requests to a host suffix over HTTP/2.
+
+        Raise ImportError if the optional HTTP/2 dependencies are missing.
+        """
+        self._http2_suffixes.add(suffix)
+        try:
+            self.configure_host(suffix)
+        except ImportError:
+            self._http2_suffixes.discard(suffix)
+            raise
+
+    def disable_http2(self, suffix: str = "music.youtube.com"):
+        self._http2_suffixes.discard(suffix)
+        self.configure_host(suffix)
+
+    def send(self, request, **kwargs):
+        if not self.observers and not logger.isEnabledFor(logging.DEBUG):
+            return super().send(request, **kwargs)
+        # Redirects call send again; only the outermost call is recorded.
+        depth = getattr(self._local, "depth", 0)
+        self._local.depth = depth + 1
+        start = time.perf_counter()
+        try:
+            response = super().send(request, **kwargs)
+        finally:
+            self._local.depth = depth
+        if depth:
+            return response
+        record = YtmusicRequestRecord(response, time.perf_counter() - start)
+        logger.debug(
+            "[ytmusic] Requesting: [%s] %s; Response: [%s] %s/%s bytes (%s), "
+            "ttfb %.0fms, total %.0fms.",
+            record.method,
+            record.url,
+            record.status,
+            record.wire_bytes,
+            record.body_bytes,
+            record.content_encoding or "identity",
+            record.ttfb * 1000,
+            record.latency * 1000,
+        )
+        for observer in list(self.observers):
+            try:
+                observer(record)
+            except Exception:
+                logger.exception("request observer failed")
+        return response
+
+    def get_adapter(self, url):
+        url_parts = urlsplit(url)
+        if url_parts.scheme == "https":
+            host = url_parts.hostname or ""
+            for suffix, adapter in self._host_adapters.items():
+                if host == suffix or host.endswith("." + suffix):
+                    return adapter
+        return super().get_adapter(url)
+
+    def reap_idle(self) -> int:
+        return sum(adapter.reap_idle() for adapter in self._host_adapters.values())
+
+    def pool_stats(self) -> dict:
+        return {
+            suffix: adapter.stats() for suffix, adapter in self._host_adapters.items()
+        }
+
+    def close(self):
+        for adapter in self._host_adapters.values():
+            adapter.close()
+        super().close()
+
+    def _mount_policy(self, policy: HostPolicy):
+        if policy.suffix in self._http2_suffixes:
+            from fuo_ytmusic.http2 import YtmusicHTTP2Adapter
+
+            adapter = YtmusicHTTP2Adapter(max_connections=policy.pool_maxsize)
+        else:
+            adapter = YtmusicHTTPAdapter(
+                policy.pool_maxsize, policy.max_retries, max_idle=self.max_idle
+            )
+        self._host_adapters[policy.suffix] = adapter
@@ -0,0 +1,131 @@
+import threading
+from concurrent.futures import Future
+from typing import Callable, Dict, Hashable, Optional, Tuple
+
+from fuo_ytmusic.cache import LruTtlCache
+
+
+def normalize_query(text: str) -> str:
+    return " ".join(text.casefold().split())
+
+
+class YtmusicTypeahead:
+    """Search as the user types.
+
+    `query` is called on every keystroke. The fetch only starts after the
+    text has been stable for `delay` seconds; a newer query cancels the
+    previous one if its fetch has not started. Identical queries share one
+    fetch, and results are cached by normalized query, so `refine` can
+    answer a longer query from the results of a cached prefix at once.
+    """
+
+    def __init__(
+        self,
+        fetch: Callable[[str], list],
+        get_executor: Callable,
+        text_of: Callable[[object], str],
+        scope: Callable[[], Hashable] = lambda: None,
+        delay: float = 0.2,
+        maxsize: int = 64,
+        ttl: float = 600,
+    ):
+        self._fetch = fetch
+        self._get_executor = get_executor
+        self._text_of = text_of
+        self._scope = scope
+        self.delay = delay
+        self._cache = LruTtlCache(maxsize, ttl)
+        self._lock = threading.Lock()
+        self._pending: Optional[Tuple[Future, threading.Timer]] = None
+        self._inflight: Dict[Hashable, Future] = {}
+
+    def query(self, text: str) -> Future:
+        """Return a future of the results of text.
+
+        The future is cancelled when a newer query supersedes it before its
+        fetch starts. A fetch which already started can not be interrupted;
+        its results are still cached.
+        """
+        future = Future()
+        key = (self._scope(), normalize_query(text))
+        if not key[1]:
+            self.cancel()
+            future.set_result([])
+            return future
+        value, exist = self._cache.get(key)
+        if exist:
+            self.cancel()
+            future.set_result(value)
+            return future
+        timer = threading.Timer(self.delay, self._start, args=(key, future))
+        timer.daemon = True
+        with self._lock:
+            self._cancel_pending()
+            self._pending = (future, timer)
+        timer.start()
+        return future
+
+    def refine(self, text: str) -> Optional[list]:
+        """Filter the cached results of the longest cached prefix of text.
+
+        Return None if no prefix is cached.
+        """
+        scope, query = self._scope(), normalize_query(text)
+        for end in range(len(query), 0, -1):
+            value, exist = self._cache.get((scope, query[:end]))
+            if not exist:
+                continue
+            if end == len(query):
+                return value
+            words = query.split()
+            return [
+                item
+                for item in value
+                if all(word in self._text_of(item).casefold() for word in words)
+            ]
+        return None
+
+    def cancel(self):
+        with self._lock:
+            self._cancel_pending()
+
+    def clear(self):
+        self.cancel()
+        self._cache.clear()
+
+    def _cancel_pending(self):
+        if self._pending is not None:
+            future, timer = self._pending
+            timer.cancel()
+            future.cancel()
+            self._pending = None
+
+    def _start(self, key, future: Future):
+        with self._lock:
+            if self._pending is None or self._pending[0] is not future:
+                return
+            self._pending = None
+            if not future.set_running_or_notify_cancel():
+                return
+            fetch_future = self._inflight.get(key)
+            if fetch_future is None:
+                fetch_future = self._get_executor().submit(self._fetch_and_cache, key)
+                self._inflight[key] = fetch_future
+        fetch_future.add_done_callback(lambda f: _copy_outcome(f, future))
+
+    def _fetch_and_cache(self, key):
+        try:
+            value = self._fetch(key[1])
+            self._cache.set(key, value)
+            return value
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+
+
+def _copy_outcome(source: Future, target: Future):
+    error = source.exception()
+    if error is not None:
+        target.set_exception(error)
+    else:
+        target.set_result(source.result())
@@ -0,0 +1,85 @@
+import logging
+import os
+import threading
+from contextlib import contextmanager
+from typing import Callable, Dict, Hashable, List, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class YtdlpExtractorPool:
+    """Keep prepared YoutubeDL instances around, keyed by their options.
+
+    Constructing YoutubeDL registers extractors and loads the cookiefile,
+    which is too slow to do for every song switch. An instance is lent to a
+    single caller at a time, so the pool can be shared between threads.
+    """
+
+    def __init__(self, factory: Callable[[dict], object], max_idle_per_key: int = 2):
+        self._factory = factory
+        self._max_idle_per_key = max_idle_per_key
+        self._idle: Dict[Hashable, List[object]] = {}
+        self._lock = threading.Lock()
+        # Instances created before the latest clear() are not given back.
+        self._generation = 0
+
+    @contextmanager
+    def extractor(self, opts: dict):
+        key = self._make_key(opts)
+        with self._lock:
+            generation = self._generation
+            idle = self._idle.get(key)
+            ydl = idle.pop() if idle else None
+        if ydl is None:
+            ydl = self._factory(opts)
+        try:
+            yield ydl
+        except BaseException:
+            # The instance may be left in a bad state, do not reuse it.
+            self._close(ydl)
+            raise
+        with self._lock:
+            idle = self._idle.setdefault(key, [])
+            if generation == self._generation and len(idle) < self._max_idle_per_key:
+                idle.append(ydl)
+                return
+        self._close(ydl)
+
+    def clear(self):
+        """Close idle instances, e.g. after the proxy or timeout is changed."""
+        with self._lock:
+            self._generation += 1
+            instances = [ydl for idle in self._idle.values() for ydl in idle]
+            self._idle.clear()
+        for ydl in instances:
+            self._close(ydl)
+
+    def idle_count(self) -> int:
+        with self._lock:
+            return sum(len(idle) for idle in self._idle.values())
+
+    @staticmethod
+    def _make_key(opts: dict) -> Tuple:
+        items = []
+        for name, value in sorted(opts.items()):
+            if not isinstance(value, Hashable):
+                value = repr(value)
+            items.append((name, value))
+        cookiefile = opts.get("cookiefile")
+        if cookiefile:
+            # The cookiefile is rewritten when the auth cookie is updated.
+            try:
+                items.append(("cookiefile_mtime", os.stat(cookiefile).st_mtime_ns))
+            except OSError:
+                items.append(("cookiefile_mtime", None))
+        return tuple(items)
+
+    @staticmethod
+    def _close(ydl):
+        close = getattr(ydl, "close", None)
+        if close is None:
+            return
+        try:
+            close()
+        except Exception as e:
+            logger.debug("close yt-dlp instance failed: %s", e)
@@ -0,0 +1,71 @@
+"""Benchmark the single-pass home classifier against one pass per type.
+
+Run with:
+  uv run pytest manual_tests/home_classifier_benchmark_test.py -s --run-manual-tests
+"""
+
+import json
+import timeit
+from pathlib import Path
+
+import pytest
+
+from fuo_ytmusic.home_recommendation import YtmusicHomeRecommendationBuilder
+
+FIXTURES_DIR = Path(__file__).parent.parent / "tests" / "fixtures"
+ROUNDS = 5
+
+
+def _feed(scale):
+    """Repeat every section of the fixture `scale` times with fresh ids."""
+    with (FIXTURES_DIR / "get_home.json").open(encoding="utf-8") as f:
+        sections = json.load(f)
+    contents = []
+    for i in range(scale):
+        for section in sections:
+            for item in section["contents"]:
+                item = dict(item)
+                for key in ("videoId", "playlistId", "browseId"):
+                    if item.get(key):
+                        item[key] = f"{item[key]}-{i}"
+                contents.append(item)
+    return contents
+
+
+def _build_per_type(builder, contents):
+    # The previous implementation: one pass, one classification and one
+    # dedup set per type.
+    collections = []
+    for section_type, build in builder.TYPE_ITEM_BUILDERS.items():
+        seen, models = set(), []
+        for content in builder._iter_valid_contents(contents):
+            if builder._detect_home_item_type(content) != section_type:
+                continue
+            model = build(builder, content, seen)
+            if model is not None:
+                models.append(model)
+        if models:
+            collections.append((section_type, models))
+    return collections
+
+
+@pytest.mark.manual
+@pytest.mark.parametrize("scale", [1, 10, 100])
+def test_home_classifier_benchmark(scale):
+    builder = YtmusicHomeRecommendationBuilder(source="ytmusic")
+    contents = _feed(scale)
+
+    single = builder._build_typed_collections(contents)
+    assert [(t, len(m)) for t, m in single] == [
+        (t, len(m)) for t, m in _build_per_type(builder, contents)
+    ]
+    assert {t for t, _ in single} == set(builder.TYPE_ITEM_BUILDERS)
+
+    per_type = timeit.timeit(lambda: _build_per_type(builder, contents), number=ROUNDS)
+    one_pass = timeit.timeit(
+        lambda: builder._build_typed_collections(contents), number=ROUNDS
+    )
+    print(f"\n{len(contents)} items")
+    print(f"per type:    {per_type / ROUNDS * 1000:.2f} ms")
+    print(f"single pass: {one_pass / ROUNDS * 1000:.2f} ms")
+    print(f"speedup:     {per_type / one_pass:.2f}x")
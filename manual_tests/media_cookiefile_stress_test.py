@@ -81,6 +81,8 @@ def _run_attempts(song_id: str, attempts: int) -> tuple[Counter, Counter]:
     stats: Counter = Counter()
     reasons: Counter = Counter()
     for idx in range(1, attempts + 1):
+        # Every attempt must run an extraction, not hit the media cache.
+        provider._media_cache.clear()
         try:
             media = provider.song_get_media(
                 SimpleNamespace(identifier=song_id),
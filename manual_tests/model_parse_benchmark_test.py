@@ -0,0 +1,42 @@
+"""Benchmark batch model parsing against per-item construction.
+
+Run with:
+  uv run pytest manual_tests/model_parse_benchmark_test.py -s --run-manual-tests
+"""
+
+import json
+import timeit
+from pathlib import Path
+
+import pytest
+
+from fuo_ytmusic.models import YtmusicLibrarySong
+
+FIXTURES_DIR = Path(__file__).parent.parent / "tests" / "fixtures"
+ITEMS = 1000
+ROUNDS = 20
+
+
+def _library_songs():
+    with (FIXTURES_DIR / "model_fields_get_album_ep.json").open(encoding="utf-8") as f:
+        tracks = json.load(f)["tracks"]
+    items = []
+    while len(items) < ITEMS:
+        for track in tracks:
+            items.append(dict(track, album={"id": "MPRE1", "name": track["album"]}))
+    return items[:ITEMS]
+
+
+@pytest.mark.manual
+def test_parse_list_benchmark():
+    items = _library_songs()
+    YtmusicLibrarySong.parse_list(items)  # build the adapter outside the timer
+
+    per_item = timeit.timeit(
+        lambda: [YtmusicLibrarySong(**item) for item in items], number=ROUNDS
+    )
+    batch = timeit.timeit(lambda: YtmusicLibrarySong.parse_list(items), number=ROUNDS)
+
+    print(f"per item: {per_item / ROUNDS * 1000:.2f} ms / {ITEMS} songs")
+    print(f"batch:    {batch / ROUNDS * 1000:.2f} ms / {ITEMS} songs")
+    print(f"speedup:  {per_item / batch:.2f}x")
@@ -0,0 +1,16 @@
+import pytest
+
+
+class Clock:
+    """A timer which only moves when a test sets `now`."""
+
+    def __init__(self, now=0.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return Clock()
@@ -0,0 +1,56 @@
+import asyncio
+import threading
+import time
+
+from fuo_ytmusic.aio_service import AsyncYtmusicService
+
+
+class _BlockingService:
+    def __init__(self, delay=0.05):
+        self.delay = delay
+        self.threads = set()
+        self.active = 0
+        self.max_active = 0
+        self._lock = threading.Lock()
+
+    def album_info(self, browse_id):
+        with self._lock:
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+            self.threads.add(threading.current_thread().name)
+        time.sleep(self.delay)
+        with self._lock:
+            self.active -= 1
+        return {"browseId": browse_id}
+
+    def search(self, keywords, t, scope, page_size):
+        return [keywords, t, scope, page_size]
+
+
+def test_calls_run_concurrently_on_own_executor():
+    service = _BlockingService()
+    aio_service = AsyncYtmusicService(service, max_workers=3)
+
+    async def main():
+        return await asyncio.gather(
+            *(aio_service.album_info(f"MPRE{i}") for i in range(6))
+        )
+
+    try:
+        results = asyncio.run(main())
+    finally:
+        aio_service.shutdown()
+
+    assert results == [{"browseId": f"MPRE{i}"} for i in range(6)]
+    assert service.max_active == 3
+    assert all(name.startswith("ytmusic-aio") for name in service.threads)
+
+
+def test_arguments_are_forwarded():
+    aio_service = AsyncYtmusicService(_BlockingService())
+    try:
+        result = asyncio.run(aio_service.search("周杰伦", None, page_size=5))
+    finally:
+        aio_service.shutdown()
+
+    assert result == ["周杰伦", None, None, 5]
@@ -0,0 +1,141 @@
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+
+import pytest
+
+from fuo_ytmusic import cache as cache_module
+from fuo_ytmusic.cache import LruTtlCache, SingleFlight, scoped_cache, single_flight
+
+
+def test_lru_ttl_cache_evicts_least_recently_used():
+    cache = LruTtlCache(maxsize=2, ttl=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == (1, True)
+
+    cache.set("c", 3)
+
+    assert cache.get("b") == (None, False)
+    assert cache.get("a") == (1, True)
+    assert cache.get("c") == (3, True)
+    stats = cache.stats()
+    assert stats["hits"] == 3
+    assert stats["misses"] == 1
+    assert stats["evictions"] == 1
+    assert stats["size"] == 2
+
+
+def test_lru_ttl_cache_expires_entries(clock):
+    cache = LruTtlCache(maxsize=2, ttl=10, timer=clock)
+    cache.set("a", 1)
+
+    clock.now = 9
+    assert cache.get("a") == (1, True)
+    clock.now = 10
+    assert cache.get("a") == (None, False)
+    assert len(cache) == 0
+
+
+def test_lru_ttl_cache_configure_shrinks_capacity():
+    cache = LruTtlCache(maxsize=3, ttl=60)
+    for key in "abc":
+        cache.set(key, key)
+
+    cache.configure(maxsize=1)
+
+    assert cache.get("c") == ("c", True)
+    assert cache.get("a") == (None, False)
+    assert cache.stats()["evictions"] == 2
+
+
+class _Service:
+    def __init__(self):
+        self.scope = ("en", "")
+        self.calls = 0
+
+    def _cache_scope(self):
+        return self.scope
+
+    @scoped_cache(maxsize=4, ttl=60)
+    def fetch(self, key):
+        self.calls += 1
+        return f"{key}-{self.calls}"
+
+    @single_flight
+    def slow_fetch(self, key, gate):
+        self.calls += 1
+        assert gate.wait(timeout=5)
+        if key == "bad":
+            raise ValueError(key)
+        return [key]
+
+
+def test_scoped_cache_keys_by_scope_and_arguments():
+    _Service.fetch.cache_clear()
+    service = _Service()
+
+    assert service.fetch("a") == "a-1"
+    assert service.fetch("a") == "a-1"
+    assert service.fetch("b") == "b-2"
+
+    service.scope = ("en", "gaia-2")
+    assert service.fetch("a") == "a-3"
+    service.scope = ("zh_CN", "")
+    assert service.fetch("a") == "a-4"
+    assert service.calls == 4
+
+
+@pytest.fixture
+def followers(monkeypatch):
+    """Released once per caller which waits for the result of another call."""
+    joined = threading.Semaphore(0)
+
+    class _Future(Future):
+        def result(self, timeout=None):
+            joined.release()
+            return super().result(timeout)
+
+    monkeypatch.setattr(cache_module, "Future", _Future)
+    return joined
+
+
+def _wait_for_followers(joined, count):
+    for _ in range(count):
+        assert joined.acquire(timeout=5)
+
+
+def test_single_flight_shares_concurrent_calls(followers):
+    service = _Service()
+    gate = threading.Event()
+    with ThreadPoolExecutor(max_workers=3) as executor:
+        futures = [executor.submit(service.slow_fetch, "a", gate) for _ in range(3)]
+        _wait_for_followers(followers, 2)
+        gate.set()
+        results = [f.result() for f in futures]
+
+    assert service.calls == 1
+    assert results[0] == ["a"]
+    assert all(r is results[0] for r in results)
+    assert len(_Service.slow_fetch.flight) == 0
+
+    # Nothing is kept once the call returned.
+    assert service.slow_fetch("a", gate) == ["a"]
+    assert service.calls == 2
+
+
+def test_single_flight_shares_exceptions(followers):
+    flight = SingleFlight()
+    gate = threading.Event()
+
+    def fail():
+        assert gate.wait(timeout=5)
+        raise ValueError("boom")
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        futures = [executor.submit(flight.do, "k", fail) for _ in range(2)]
+        _wait_for_followers(followers, 1)
+        gate.set()
+        for future in futures:
+            with pytest.raises(ValueError):
+                future.result()
+    assert len(flight) == 0
@@ -0,0 +1,120 @@
+from fuo_ytmusic import service as service_module
+from fuo_ytmusic.disk_cache import YtmusicDiskCache
+
+
+def test_disk_cache_round_trip(tmp_path):
+    path = tmp_path / "cache.sqlite3"
+    cache = YtmusicDiskCache(path)
+    cache.set("k", {"title": "周杰伦", "items": [1, 2]}, stored_at=100)
+    cache.close()
+
+    reopened = YtmusicDiskCache(path)
+    assert reopened.get("k") == ({"title": "周杰伦", "items": [1, 2]}, 100)
+    assert reopened.get("missing") is None
+
+    reopened.purge(older_than=101)
+    assert reopened.get("k") is None
+
+
+def test_disk_cache_skips_unserializable_payload(tmp_path):
+    cache = YtmusicDiskCache(tmp_path / "cache.sqlite3")
+
+    assert cache.set("k", {"v": object()}) is False
+    assert cache.get("k") is None
+
+
+class _ChartsApi:
+    def __init__(self, payload):
+        self.payload = payload
+        self.calls = 0
+
+    def get_charts(self, *_args, **_kwargs):
+        self.calls += 1
+        return self.payload
+
+
+class TestServiceDiskCache:
+    def setup_method(self):
+        self.service = service_module.YtmusicService()
+        self.service.get_charts.cache_clear()
+
+    def teardown_method(self):
+        self.service.setup_disk_cache(None)
+        self.service.get_charts.cache_clear()
+
+    def test_payload_is_served_from_disk_after_restart(self, tmp_path):
+        self.service.setup_disk_cache(tmp_path / "cache.sqlite3")
+        self.service._api = _ChartsApi({"videos": [{"playlistId": "PL-1"}]})
+        self.service.get_charts("ZZ")
+
+        # Simulate a restart: empty memory cache and a fresh api object.
+        self.service.get_charts.cache_clear()
+        api = _ChartsApi({"videos": []})
+        self.service._api = api
+
+        assert self.service.get_charts("ZZ") == {"videos": [{"playlistId": "PL-1"}]}
+        assert api.calls == 0
+
+    def test_stale_payload_is_served_and_revalidated(
+        self, tmp_path, monkeypatch, clock
+    ):
+        monkeypatch.setattr(self.service, "_timer", clock)
+        self.service.setup_disk_cache(tmp_path / "cache.sqlite3")
+        self.service._api = _ChartsApi({"videos": ["old"]})
+        self.service.get_charts("ZZ")
+        self.service.get_charts.cache_clear()
+        api = _ChartsApi({"videos": ["new"]})
+        self.service._api = api
+
+        futures = []
+        revalidate = self.service._revalidate
+
+        def _capture_revalidate(*args):
+            future = revalidate(*args)
+            futures.append(future)
+            return future
+
+        monkeypatch.setattr(self.service, "_revalidate", _capture_revalidate)
+        clock.now += service_module.DISK_CACHE_FRESH_TTL + 1
+        # Cached in memory from the network, not concerned by the revalidation.
+        assert self.service.get_charts("US") == {"videos": ["new"]}
+
+        assert self.service.get_charts("ZZ") == {"videos": ["old"]}
+        futures[0].result(timeout=5)
+
+        assert api.calls == 2
+        get_charts = type(self.service).get_charts
+        # Only the revalidated entry was dropped from the memory cache.
+        assert not get_charts.cache.get(get_charts.cache_key(self.service))[1]
+        assert get_charts.cache.get(get_charts.cache_key(self.service, "US"))[1]
+        assert self.service.get_charts() == {"videos": ["new"]}
+        assert api.calls == 2
+
+
+class _LibraryApi:
+    def __init__(self):
+        self.playlists = [{"title": "Old", "playlistId": "PL-old"}]
+
+    def get_library_playlists(self, *_args, **_kwargs):
+        return list(self.playlists)
+
+    def create_playlist(self, title, *_args, **_kwargs):
+        self.playlists.insert(0, {"title": title, "playlistId": "PL-new"})
+        return "PL-new"
+
+
+def test_created_playlist_is_listed_with_disk_cache(tmp_path):
+    service = service_module.YtmusicService()
+    service.setup_disk_cache(tmp_path / "cache.sqlite3")
+    service._api = _LibraryApi()
+    try:
+        assert [p.playlistId for p in service.library_playlists()] == ["PL-old"]
+
+        assert service.create_playlist(
+            "New", "", service_module.YtmusicPrivacyStatus.PRIVATE
+        )
+
+        playlists = service.library_playlists()
+        assert [p.playlistId for p in playlists] == ["PL-new", "PL-old"]
+    finally:
+        service.setup_disk_cache(None)
@@ -0,0 +1,65 @@
+import json
+
+import pytest
+
+from fuo_ytmusic.http2 import YtmusicHTTP2Adapter, http2_available
+from fuo_ytmusic.transport import YtmusicHTTPAdapter, YtmusicSession
+
+
+@pytest.mark.skipif(http2_available(), reason="HTTP/2 dependencies are installed")
+def test_session_keeps_http11_without_http2_dependencies():
+    session = YtmusicSession()
+    with pytest.raises(ImportError):
+        session.enable_http2()
+    adapter = session.get_adapter("https://music.youtube.com/youtubei/v1/browse")
+    assert isinstance(adapter, YtmusicHTTPAdapter)
+
+
+def test_http2_adapter_round_trip():
+    httpx = pytest.importorskip("httpx")
+    pytest.importorskip("h2")
+    seen = []
+
+    def handler(request):
+        seen.append(request)
+        return httpx.Response(
+            200,
+            json={"echo": json.loads(request.content)},
+            headers=[("set-cookie", "a=1"), ("set-cookie", "b=2")],
+        )
+
+    class _MockAdapter(YtmusicHTTP2Adapter):
+        def _make_transport(self, proxy, verify):
+            return httpx.MockTransport(handler)
+
+    session = YtmusicSession()
+    session._host_adapters["music.youtube.com"] = _MockAdapter()
+
+    response = session.post(
+        "https://music.youtube.com/youtubei/v1/browse", json={"browseId": "FEmusic"}
+    )
+
+    assert response.status_code == 200
+    assert response.json() == {"echo": {"browseId": "FEmusic"}}
+    assert {c.name for c in response.cookies} == {"a", "b"}
+    assert "connection" not in seen[0].headers
+    assert session.pool_stats()["music.youtube.com"]["requests"] == 1
+
+
+def test_http2_is_kept_when_the_pool_is_resized():
+    pytest.importorskip("httpx")
+    pytest.importorskip("h2")
+    session = YtmusicSession()
+    session.configure_host("music.youtube.com", pool_maxsize=4)
+    session.enable_http2()
+    assert session.pool_stats()["music.youtube.com"]["max_connections"] == 4
+
+    session.configure_host("music.youtube.com", pool_maxsize=8)
+    stats = session.pool_stats()["music.youtube.com"]
+    assert stats["http2"] is True
+    assert stats["max_connections"] == 8
+
+    session.disable_http2()
+    adapter = session.get_adapter("https://music.youtube.com/youtubei/v1/browse")
+    assert isinstance(adapter, YtmusicHTTPAdapter)
+    assert adapter.stats()["pool_maxsize"] == 8
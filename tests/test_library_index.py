@@ -0,0 +1,152 @@
+from fuo_ytmusic.library_index import YtmusicLibraryIndex
+from fuo_ytmusic.models import (
+    PlaylistNestedResult,
+    YtmusicLibraryArtist,
+    YtmusicLibrarySong,
+    YtmusicSearchAlbum,
+)
+from fuo_ytmusic.provider import YtmusicProvider
+from fuo_ytmusic.service import YtmusicLibraryKind, YtmusicScope, YtmusicType
+
+
+def _song(video_id, title, artist):
+    return YtmusicLibrarySong(
+        videoId=video_id,
+        title=title,
+        artists=[{"id": "AR", "name": artist}],
+        album={"id": "MPRE", "name": "Album"},
+    )
+
+
+class _LibraryService:
+    def __init__(self):
+        self.pages = {
+            YtmusicLibraryKind.songs: [[_song("VID1", "晴天", "周杰伦")]],
+            YtmusicLibraryKind.albums: [
+                [YtmusicSearchAlbum(browseId="MPRE1", title="Nevermind")]
+            ],
+            YtmusicLibraryKind.subscriptions: [
+                [YtmusicLibraryArtist(browseId="UC1", artist="Green Day")]
+            ],
+            YtmusicLibraryKind.playlists: [
+                [PlaylistNestedResult(playlistId="PL1", title="Road Trip", count=1)]
+            ],
+        }
+        self.tracks = {"PL1": [[_song("VID2", "Holiday", "Green Day")]]}
+        self.calls = []
+
+    def library_page(self, kind, continuation=None):
+        self.calls.append((kind.value, continuation))
+        return self._page(self.pages[kind], continuation)
+
+    def playlist_tracks_page(self, playlist_id, continuation=None):
+        self.calls.append((playlist_id, continuation))
+        return self._page(self.tracks[playlist_id], continuation)
+
+    @staticmethod
+    def _page(pages, continuation):
+        index = int(continuation or 0)
+        has_next = index + 1 < len(pages)
+        return pages[index], str(index + 1) if has_next else None
+
+
+def test_sync_and_search_offline(tmp_path):
+    index = YtmusicLibraryIndex(tmp_path / "library.sqlite3")
+    index.sync(_LibraryService(), "account-1")
+
+    def search(keyword, t, account="account-1"):
+        return [_title(m) for m in index.search(account, keyword, t)]
+
+    assert search("周杰", YtmusicType.so) == ["晴天"]
+    assert search("green day", YtmusicType.so) == ["Holiday"]
+    assert search("GREEN", YtmusicType.ar) == ["Green Day"]
+    assert search("never", YtmusicType.al) == ["Nevermind"]
+    assert search("trip", YtmusicType.pl) == ["Road Trip"]
+    assert search("green", YtmusicType.so, account="account-2") == []
+    assert index.synced_at("account-1") is not None
+
+
+def test_incremental_sync_fetches_changed_collections_only(tmp_path):
+    index = YtmusicLibraryIndex(tmp_path / "library.sqlite3")
+    service = _LibraryService()
+    index.sync(service, "account-1")
+
+    service.calls.clear()
+    assert index.sync(service, "account-1") == []
+    # One request per library collection; playlists whose listed track count
+    # did not change are not fetched.
+    assert len(service.calls) == 4
+
+    service.tracks["PL1"] = [
+        [_song("VID3", "Basket Case", "Green Day")],
+        [_song("VID4", "Minority", "Green Day")],
+    ]
+    service.pages[YtmusicLibraryKind.playlists] = [
+        [PlaylistNestedResult(playlistId="PL1", title="Road Trip", count=2)]
+    ]
+    service.calls.clear()
+    deltas = index.sync(service, "account-1")
+
+    assert [(d.collection, len(d.added), d.removed) for d in deltas] == [
+        ("playlist:PL1", 2, ["VID2"])
+    ]
+    assert [call for call in service.calls if call[0] == "PL1"] == [
+        ("PL1", None),
+        ("PL1", "1"),
+    ]
+    assert index.search("account-1", "holiday", YtmusicType.so) == []
+    assert len(index.search("account-1", "green day", YtmusicType.so)) == 2
+
+
+def test_playlist_without_count_is_compared_by_first_page(tmp_path):
+    index = YtmusicLibraryIndex(tmp_path / "library.sqlite3")
+    service = _LibraryService()
+    service.pages[YtmusicLibraryKind.playlists] = [
+        [PlaylistNestedResult(playlistId="PL1", title="Liked")]
+    ]
+    index.sync(service, "account-1")
+
+    service.calls.clear()
+    assert index.sync(service, "account-1") == []
+    assert [call for call in service.calls if call[0] == "PL1"] == [("PL1", None)]
+
+    service.tracks["PL1"] = [[_song("VID3", "Basket Case", "Green Day")]]
+    deltas = index.sync(service, "account-1")
+
+    assert [(d.collection, len(d.added), d.removed) for d in deltas] == [
+        ("playlist:PL1", 1, ["VID2"])
+    ]
+
+
+def test_provider_answers_library_scope_from_index(tmp_path):
+    provider = YtmusicProvider()
+    provider.setup_library_index(tmp_path / "library.sqlite3")
+    try:
+        account = provider.service.account_key()
+        provider._library_index.replace_collection(
+            account, "library:songs", YtmusicType.so, [_song("VID1", "晴天", "周杰伦")]
+        )
+        provider._library_index.mark_synced(account)
+
+        result = provider.search("晴天", "song", scope=YtmusicScope.li)
+    finally:
+        provider.setup_library_index(None)
+
+    assert [song.identifier for song in result.songs] == ["VID1"]
+
+
+def test_provider_falls_back_for_types_which_are_not_indexed(tmp_path):
+    provider = YtmusicProvider()
+    provider.setup_library_index(tmp_path / "library.sqlite3")
+    try:
+        account = provider.service.account_key()
+        provider._library_index.mark_synced(account)
+
+        assert provider._library_index.search(account, "live", YtmusicType.vi) is None
+        assert provider._search_library_index("live", YtmusicType.vi) is None
+    finally:
+        provider.setup_library_index(None)
+
+
+def _title(model):
+    return getattr(model, "artist", None) or model.title
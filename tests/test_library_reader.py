@@ -0,0 +1,37 @@
+from fuo_ytmusic.models import YtmusicSearchAlbum
+from fuo_ytmusic.provider import YtmusicProvider
+from fuo_ytmusic.service import YtmusicLibraryKind
+
+
+class _PagedLibraryService:
+    def __init__(self, pages):
+        self.pages = pages
+        self.calls = []
+
+    def library_page(self, kind, continuation=None):
+        self.calls.append((kind, continuation))
+        index = 0 if continuation is None else int(continuation)
+        items = [YtmusicSearchAlbum(browseId=b, title=b) for b in self.pages[index]]
+        has_next = index + 1 < len(self.pages)
+        return items, str(index + 1) if has_next else None
+
+
+def test_library_reader_fetches_pages_on_demand():
+    provider = YtmusicProvider()
+    service = _PagedLibraryService([["MPRE1", "MPRE2"], ["MPRE3"], ["MPRE4"]])
+    provider.service = service
+
+    reader = provider.current_user_fav_create_albums_rd()
+
+    assert [album.identifier for album in reader.read_range(0, 2)] == [
+        "MPRE1",
+        "MPRE2",
+    ]
+    assert service.calls == [(YtmusicLibraryKind.albums, None)]
+
+    assert [album.identifier for album in reader] == ["MPRE3", "MPRE4"]
+    assert service.calls[1:] == [
+        (YtmusicLibraryKind.albums, "1"),
+        (YtmusicLibraryKind.albums, "2"),
+    ]
+    assert reader.count == 4
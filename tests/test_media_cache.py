@@ -0,0 +1,62 @@
+import pytest
+from feeluown.media import Media, VideoAudioManifest
+
+from fuo_ytmusic.media_cache import YtmusicMediaCache, parse_url_expiry
+
+NOW = 1_700_000_000
+
+
+@pytest.fixture
+def clock(clock):
+    clock.now = NOW
+    return clock
+
+
+def _url(expire, name="audio"):
+    return f"https://rr1.googlevideo.com/videoplayback?expire={expire}&id={name}"
+
+
+def test_parse_url_expiry():
+    assert parse_url_expiry(_url(NOW)) == NOW
+    assert (
+        parse_url_expiry("https://x.googlevideo.com/videoplayback/expire/42/id/1") == 42
+    )
+    assert parse_url_expiry("https://cdn.example.com/audio.m4a") is None
+    assert parse_url_expiry("https://example.com/?noexpire=1") is None
+
+
+def test_media_cache_expires_before_url_expiry(clock):
+    cache = YtmusicMediaCache(timer=clock)
+    media = Media(_url(NOW + 3600))
+
+    assert cache.set("k", media)
+    clock.now = NOW + 3600 - cache.SAFETY_MARGIN - 1
+    assert cache.get("k") is media
+    clock.now = NOW + 3600 - cache.SAFETY_MARGIN
+    assert cache.get("k") is None
+
+
+def test_media_cache_skips_urls_about_to_expire(clock):
+    cache = YtmusicMediaCache(timer=clock)
+
+    assert cache.set("k", Media(_url(NOW + 60))) is False
+    assert cache.get("k") is None
+
+
+def test_media_cache_uses_earliest_expiry_of_manifest(clock):
+    cache = YtmusicMediaCache(timer=clock)
+    manifest = VideoAudioManifest(_url(NOW + 7200, "video"), _url(NOW + 3600))
+    cache.set("k", Media(manifest))
+
+    clock.now = NOW + 3600
+    assert cache.get("k") is None
+
+
+def test_media_cache_invalidate_url(clock):
+    cache = YtmusicMediaCache(timer=clock)
+    cache.set("a", Media(_url(NOW + 3600, "a")))
+    cache.set("b", Media(_url(NOW + 3600, "b")))
+
+    assert cache.invalidate_url(_url(NOW + 3600, "a")) == 1
+    assert cache.get("a") is None
+    assert cache.get("b") is not None
@@ -0,0 +1,102 @@
+import pytest
+
+from fuo_ytmusic.cache import LruTtlCache, scoped_cache
+from fuo_ytmusic.metrics import YtmusicMetrics
+from fuo_ytmusic.service import YtmusicService, _observe_request
+
+
+def test_metrics_quantiles_and_errors():
+    metrics = YtmusicMetrics()
+    for i in range(1, 101):
+        metrics.observe("service.search", i / 100)
+    metrics.observe("service.search", 2.0, "ReadTimeout")
+
+    call = metrics.as_dict()["calls"]["service.search"]
+    assert call["count"] == 101
+    assert call["p50"] == 0.51
+    assert call["p95"] == 0.96
+    assert call["p99"] == 1.0
+    assert call["errors"] == {"ReadTimeout": 1}
+
+
+def test_metrics_timer_records_exceptions(clock):
+    metrics = YtmusicMetrics(timer=clock)
+
+    @metrics.timer("ytdlp.extract_info")
+    def extract(fail):
+        clock.now += 0.5
+        if fail:
+            raise ValueError("boom")
+        return "info"
+
+    assert extract(False) == "info"
+    with pytest.raises(ValueError):
+        extract(True)
+
+    call = metrics.as_dict()["calls"]["ytdlp.extract_info"]
+    assert call["count"] == 2
+    assert call["sum"] == 1.0
+    assert call["errors"] == {"ValueError": 1}
+
+
+class _Service:
+    def _cache_scope(self):
+        return None
+
+    @scoped_cache(maxsize=4, ttl=60)
+    def album_info(self, browse_id):
+        return browse_id
+
+    def setup_language(self, language):
+        pass
+
+
+def test_metrics_instrument_keeps_method_attributes():
+    metrics = YtmusicMetrics()
+    metrics.instrument(
+        _Service, "service", exclude=lambda name: name.startswith("setup_")
+    )
+    _Service.album_info.cache_clear()
+    service = _Service()
+
+    service.album_info("MPRE1")
+    service.album_info("MPRE1")
+    service.setup_language("en")
+
+    calls = metrics.as_dict()["calls"]
+    assert calls["service.album_info"]["count"] == 2
+    assert "service.setup_language" not in calls
+    assert _Service.album_info.cache.stats()["hits"] == 1
+
+
+def test_metrics_prometheus_text():
+    metrics = YtmusicMetrics()
+    cache = LruTtlCache(4, 60)
+    cache.set("a", 1)
+    cache.get("a")
+    cache.get("b")
+    metrics.add_cache_source("service", lambda: {"album_info": cache.stats()})
+    metrics.observe("http.browse", 0.25)
+    metrics.observe("http.browse", 0.5, "HTTP503")
+
+    caches = metrics.as_dict()["caches"]
+    assert caches["service.album_info"]["hit_ratio"] == 0.5
+    text = metrics.prometheus_text()
+    assert 'ytmusic_call_seconds{name="http.browse",quantile="0.5"} 0.25' in text
+    assert 'ytmusic_call_seconds_count{name="http.browse"} 2' in text
+    assert 'ytmusic_call_errors_total{name="http.browse",error="HTTP503"} 1' in text
+    assert 'ytmusic_cache_hits_total{cache="service.album_info"} 1' in text
+    assert text.endswith("\n")
+
+
+def test_http_metrics_observer_is_only_registered_when_enabled():
+    service = YtmusicService()
+    observers = service._session.observers
+    assert _observe_request not in observers
+
+    service.setup_http_metrics(True)
+    service.setup_http_metrics(True)
+    assert observers.count(_observe_request) == 1
+
+    service.setup_http_metrics(False)
+    assert _observe_request not in observers
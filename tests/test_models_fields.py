@@ -4,7 +4,13 @@ from pathlib import Path
 from feeluown.library import AlbumType
 from feeluown.media import Quality
 
-from fuo_ytmusic.models import AlbumInfo, ArtistInfo, SongInfo, YtmusicSearchVideo
+from fuo_ytmusic.models import (
+    AlbumInfo,
+    ArtistInfo,
+    SongInfo,
+    YtmusicLibrarySong,
+    YtmusicSearchVideo,
+)
 
 FIXTURES_DIR = Path(__file__).parent / "fixtures"
 
@@ -77,3 +83,13 @@ def test_song_info_supports_audio_quality_and_media_mapping():
     if Quality.Audio.sq in audio_qualities:
         sq_itag, _, _ = song.get_media(Quality.Audio.sq)
         assert sq_itag is not None
+
+
+def test_parse_list_matches_per_item_construction():
+    tracks = _load_fixture("model_fields_get_album_ep.json")["tracks"]
+    items = [dict(t, album={"id": "MPRE1", "name": t["album"]}) for t in tracks]
+
+    assert YtmusicLibrarySong.parse_list(items) == [
+        YtmusicLibrarySong(**item) for item in items
+    ]
+    assert YtmusicLibrarySong.parse_list([]) == []
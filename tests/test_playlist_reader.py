@@ -0,0 +1,72 @@
+from fuo_ytmusic.models import PlaylistInfo, YtmusicLibrarySong
+
+
+def _track(video_id):
+    return YtmusicLibrarySong(videoId=video_id, title=f"Song {video_id}")
+
+
+class _ServiceStub:
+    def __init__(self, pages):
+        # pages: {continuation: (video_ids, next_continuation)}
+        self._pages = pages
+        self.calls = []
+
+    def playlist_tracks_page(self, playlist_id, continuation=None):
+        self.calls.append((playlist_id, continuation))
+        video_ids, next_continuation = self._pages[continuation]
+        return [_track(v) for v in video_ids], next_continuation
+
+
+class _ProviderStub:
+    def __init__(self, service):
+        self.service = service
+
+
+def test_reader_follows_continuations_without_refetching():
+    service = _ServiceStub(
+        {
+            None: (["a", "b"], "c1"),
+            "c1": (["c", "d"], "c2"),
+            "c2": (["e"], None),
+        }
+    )
+    playlist = PlaylistInfo(id="PL1", trackCount=5, tracks=[])
+
+    reader = playlist.reader(_ProviderStub(service))
+
+    assert [song.identifier for song in reader.readall()] == ["a", "b", "c", "d", "e"]
+    assert service.calls == [("PL1", None), ("PL1", "c1"), ("PL1", "c2")]
+
+
+def test_reader_fetches_pages_lazily():
+    service = _ServiceStub({None: (["a", "b"], "c1"), "c1": (["c"], None)})
+    playlist = PlaylistInfo(id="PL1", trackCount=3, tracks=[])
+
+    reader = playlist.reader(_ProviderStub(service))
+    reader.read_range(0, 2)
+
+    assert service.calls == [("PL1", None)]
+
+
+def test_reader_skips_repeated_item_at_page_boundary():
+    service = _ServiceStub({None: (["a", "b"], "c1"), "c1": (["b", "c"], None)})
+    playlist = PlaylistInfo(id="PL1", trackCount=None, tracks=[])
+
+    reader = playlist.reader(_ProviderStub(service))
+
+    assert [song.identifier for song in reader] == ["a", "b", "c"]
+    assert reader.count == 3
+
+
+def test_interleaved_readers_of_one_cached_playlist():
+    service = _ServiceStub({None: (["a", "b"], "c1"), "c1": (["c", "d"], None)})
+    # playlist_info is cached, so readers may share one PlaylistInfo.
+    playlist = PlaylistInfo(id="PL1", trackCount=4, tracks=[])
+    provider = _ProviderStub(service)
+
+    first = iter(playlist.reader(provider))
+    assert next(first).identifier == "a"
+    second = playlist.reader(provider)
+    assert [song.identifier for song in second] == ["a", "b", "c", "d"]
+
+    assert [song.identifier for song in first] == ["b", "c", "d"]
@@ -0,0 +1,50 @@
+import threading
+from types import SimpleNamespace
+
+from fuo_ytmusic.prefetch import YtmusicMediaPrefetcher
+
+
+def _song(identifier):
+    return SimpleNamespace(identifier=identifier)
+
+
+def _make_key(song, quality):
+    return song.identifier, quality
+
+
+def test_prefetch_resolves_upcoming_songs():
+    resolved = []
+
+    def _resolve(song, quality):
+        resolved.append(song.identifier)
+        return f"media-{song.identifier}"
+
+    prefetcher = YtmusicMediaPrefetcher(_resolve, _make_key)
+    futures = prefetcher.prefetch([_song("a"), _song("b"), _song("a")], "sq")
+
+    assert [f.result(timeout=5) for f in futures] == ["media-a", "media-b"]
+    assert sorted(resolved) == ["a", "b"]
+    prefetcher.shutdown()
+
+
+def test_prefetch_cancels_songs_no_longer_upcoming():
+    started = threading.Event()
+    release = threading.Event()
+
+    def _resolve(song, quality):
+        started.set()
+        release.wait(timeout=5)
+        return song.identifier
+
+    prefetcher = YtmusicMediaPrefetcher(_resolve, _make_key, max_workers=1)
+    running, queued = prefetcher.prefetch([_song("a"), _song("b")], "sq")
+    assert started.wait(timeout=5)
+
+    (kept,) = prefetcher.prefetch([_song("a")], "sq")
+    release.set()
+
+    assert kept is running
+    assert queued.cancelled()
+    assert running.result(timeout=5) == "a"
+    assert prefetcher.get_pending(("b", "sq")) is None
+    prefetcher.shutdown()
@@ -1,9 +1,10 @@
 import copy
+import threading
 from types import SimpleNamespace
 
 import pytest
 from feeluown.excs import ProviderIOError
-from feeluown.media import MediaType, Quality
+from feeluown.media import Media, MediaType, Quality
 from yt_dlp import DownloadError
 
 from fuo_ytmusic import provider as provider_module
@@ -19,10 +20,20 @@ class _ServiceStub:
     def __init__(self, api):
         self.api = api
         self.timeout = None
+        self.forbidden_urls = set()
+        self.checked_urls = []
+        self.account = "gaia-1"
+
+    def account_key(self):
+        return self.account
 
     def setup_timeout(self, timeout):
         self.timeout = timeout
 
+    def check_stream_url(self, url):
+        self.checked_urls.append(url)
+        return url not in self.forbidden_urls
+
 
 class _YtdlpCapture:
     last_opts = None
@@ -45,6 +56,14 @@ class _YtdlpCapture:
         }
 
 
+class _YtdlpCounting(_YtdlpCapture):
+    instances = 0
+
+    def __init__(self, opts):
+        super().__init__(opts)
+        self.__class__.instances += 1
+
+
 class _YtdlpFailure:
     def __init__(self, _opts):
         pass
@@ -160,6 +179,147 @@ def test_video_get_media_uses_configured_timeout(monkeypatch):
     assert "cookiefile" not in _YtdlpCaptureVideo.last_opts
 
 
+def test_song_get_media_reuses_ytdlp_instance(monkeypatch):
+    provider = YtmusicProvider()
+    provider.service = _ServiceStub(_ApiStub())
+    monkeypatch.setattr(provider, "_get_ytdlp_cookiefile_path", lambda: "")
+    monkeypatch.setattr(provider_module, "_NoCookieSaveYoutubeDL", _YtdlpCounting)
+    _YtdlpCounting.instances = 0
+
+    for index in range(3):
+        provider.song_get_media(
+            SimpleNamespace(identifier=f"video-{index}"), Quality.Audio.sq
+        )
+    assert _YtdlpCounting.instances == 1
+
+    provider.setup_http_timeout(8)
+    provider.song_get_media(SimpleNamespace(identifier="video-3"), Quality.Audio.sq)
+    assert _YtdlpCounting.instances == 2
+    assert _YtdlpCounting.last_opts["socket_timeout"] == 8
+
+
+def test_song_get_media_serves_replays_from_cache(monkeypatch):
+    provider = YtmusicProvider()
+    provider.service = _ServiceStub(_ApiStub())
+    monkeypatch.setattr(provider, "_get_ytdlp_cookiefile_path", lambda: "")
+    monkeypatch.setattr(provider_module, "_NoCookieSaveYoutubeDL", _YtdlpCapture)
+    calls = []
+    resolve = provider._song_get_media_from_ytdlp
+
+    def _counting_resolve(song):
+        calls.append(song.identifier)
+        return resolve(song)
+
+    monkeypatch.setattr(provider, "_song_get_media_from_ytdlp", _counting_resolve)
+    song = SimpleNamespace(identifier="video-id")
+
+    first = provider.song_get_media(song, Quality.Audio.sq)
+    assert provider.song_get_media(song, Quality.Audio.sq) is first
+    assert calls == ["video-id"]
+    # Replays never wait for a stream url check.
+    assert provider.service.checked_urls == []
+
+    provider._media_cache.invalidate_url(first.url)
+    provider.song_get_media(song, Quality.Audio.sq)
+    assert calls == ["video-id", "video-id"]
+
+
+def test_song_get_media_resolves_again_for_another_account(monkeypatch):
+    provider = YtmusicProvider()
+    provider.service = _ServiceStub(_ApiStub())
+    monkeypatch.setattr(provider, "_get_ytdlp_cookiefile_path", lambda: "")
+    monkeypatch.setattr(provider_module, "_NoCookieSaveYoutubeDL", _YtdlpCapture)
+    song = SimpleNamespace(identifier="video-id")
+
+    first = provider.song_get_media(song, Quality.Audio.sq)
+    provider.service.account = "gaia-2"
+    second = provider.song_get_media(song, Quality.Audio.sq)
+    assert second is not first
+
+    provider.service.account = "gaia-1"
+    assert provider.song_get_media(song, Quality.Audio.sq) is first
+
+
+def test_song_get_media_resolves_again_after_loading_failed(monkeypatch):
+    provider = YtmusicProvider()
+    provider.service = _ServiceStub(_ApiStub())
+    monkeypatch.setattr(provider, "_get_ytdlp_cookiefile_path", lambda: "")
+    monkeypatch.setattr(provider_module, "_NoCookieSaveYoutubeDL", _YtdlpCapture)
+    song = SimpleNamespace(identifier="video-id")
+
+    first = provider.song_get_media(song, Quality.Audio.sq)
+    provider.media_loading_failed(first)
+    second = provider.song_get_media(song, Quality.Audio.sq)
+    assert second is not first
+    assert provider.song_get_media(song, Quality.Audio.sq) is second
+
+
+def test_song_prefetch_media_resolves_again_when_cached_url_is_forbidden(
+    monkeypatch,
+):
+    provider = YtmusicProvider()
+    provider.service = _ServiceStub(_ApiStub())
+    monkeypatch.setattr(provider, "_get_ytdlp_cookiefile_path", lambda: "")
+    monkeypatch.setattr(provider_module, "_NoCookieSaveYoutubeDL", _YtdlpCapture)
+    song = SimpleNamespace(identifier="video-id")
+
+    first = provider.song_get_media(song, Quality.Audio.sq)
+    [future] = provider.song_prefetch_media([song], Quality.Audio.sq)
+    assert future.result(timeout=5) is first
+    assert provider.service.checked_urls == [first.url]
+
+    provider.service.forbidden_urls.add(first.url)
+    [future] = provider.song_prefetch_media([song], Quality.Audio.sq)
+    second = future.result(timeout=5)
+    assert second is not first
+    # The media resolved again replaced the rejected one in the cache.
+    assert provider.song_get_media(song, Quality.Audio.sq) is second
+
+
+def test_song_prefetch_media_fills_media_cache(monkeypatch):
+    provider = YtmusicProvider()
+    provider.service = _ServiceStub(_ApiStub())
+    monkeypatch.setattr(provider, "_get_ytdlp_cookiefile_path", lambda: "")
+    monkeypatch.setattr(provider_module, "_NoCookieSaveYoutubeDL", _YtdlpCounting)
+    _YtdlpCounting.instances = 0
+    songs = [SimpleNamespace(identifier=f"video-{i}") for i in range(5)]
+
+    futures = provider.song_prefetch_media(songs, Quality.Audio.sq, limit=2)
+    prefetched = [future.result(timeout=5) for future in futures]
+
+    assert len(prefetched) == 2
+    assert provider.song_get_media(songs[0], Quality.Audio.sq) is prefetched[0]
+    assert provider.song_get_media(songs[1], Quality.Audio.sq) is prefetched[1]
+
+
+def test_song_list_media_reports_partial_failures(monkeypatch):
+    provider = YtmusicProvider()
+    provider.service = _ServiceStub(_ApiStub())
+    monkeypatch.setattr(provider, "_get_ytdlp_cookiefile_path", lambda: "")
+    release = threading.Event()
+
+    def _resolve(song):
+        if song.identifier == "bad":
+            raise DownloadError("bot check", None)
+        if song.identifier == "slow":
+            release.wait(timeout=5)
+        return Media(f"https://cdn.example.com/{song.identifier}.m4a")
+
+    monkeypatch.setattr(provider, "_song_get_media_from_ytdlp", _resolve)
+    songs = [SimpleNamespace(identifier=i) for i in ("a", "bad", "slow", "b")]
+
+    try:
+        results = provider.song_list_media(songs, max_workers=2, timeout=0.3)
+    finally:
+        release.set()
+
+    assert [r.song.identifier for r in results] == ["a", "bad", "slow", "b"]
+    assert [r.ok for r in results] == [True, False, False, True]
+    assert results[0].media.url == "https://cdn.example.com/a.m4a"
+    assert isinstance(results[1].error, ProviderIOError)
+    assert isinstance(results[2].error, TimeoutError)
+
+
 def test_get_ytdlp_cookiefile_path_requires_current_user(monkeypatch, tmp_path):
     headerfile = tmp_path / "ytmusic_header.json"
     headerfile.write_text("{}", encoding="utf-8")
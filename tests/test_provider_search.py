@@ -0,0 +1,81 @@
+import threading
+
+from fuo_ytmusic.models import YtmusicSearchAlbum, YtmusicSearchArtist
+from fuo_ytmusic.provider import YtmusicProvider
+from fuo_ytmusic.service import YtmusicType
+
+
+class _GatedSearchService:
+    """Each search type returns only after its gate is opened."""
+
+    def __init__(self):
+        self.gates = {t: threading.Event() for t in YtmusicType}
+        self.started = []
+
+    def search(self, keyword, t, scope=None):
+        self.started.append((keyword, t))
+        assert self.gates[t].wait(timeout=5)
+        if t == YtmusicType.al:
+            return [YtmusicSearchAlbum(browseId="MPRE1", title=keyword)]
+        if t == YtmusicType.ar:
+            return [YtmusicSearchArtist(browseId="UC1", artist=keyword)]
+        raise RuntimeError("boom")
+
+
+def test_search_concurrently_yields_results_as_they_arrive():
+    provider = YtmusicProvider()
+    service = _GatedSearchService()
+    provider.service = service
+
+    results = provider.search_concurrently("abc", types=["album", "artist", "song"])
+    service.gates[YtmusicType.ar].set()
+    first = next(results)
+    service.gates[YtmusicType.so].set()
+    service.gates[YtmusicType.al].set()
+    rest = list(results)
+
+    assert [a.name for a in first.artists] == ["abc"]
+    # The failed song search is skipped.
+    assert [[a.name for a in r.albums] for r in rest] == [["abc"]]
+
+
+def test_new_search_supersedes_previous_one():
+    provider = YtmusicProvider()
+    service = _GatedSearchService()
+    provider.service = service
+
+    old = provider.search_concurrently("old", types=["album"])
+    new = provider.search_concurrently("new", types=["artist"])
+    for gate in service.gates.values():
+        gate.set()
+
+    assert list(old) == []
+    assert [[a.name for a in r.artists] for r in new] == [["new"]]
+
+
+class _PagedSearchService:
+    def __init__(self, pages):
+        self.pages = pages
+        self.calls = []
+
+    def search_page(self, keyword, t, scope=None, continuation=None):
+        self.calls.append((keyword, t, continuation))
+        index = 0 if continuation is None else int(continuation)
+        items = [YtmusicSearchAlbum(browseId=b, title=b) for b in self.pages[index]]
+        has_next = index + 1 < len(self.pages)
+        return items, str(index + 1) if has_next else None
+
+
+def test_search_rd_fetches_pages_on_demand():
+    provider = YtmusicProvider()
+    service = _PagedSearchService([["MPRE1", "MPRE2"], ["MPRE3"]])
+    provider.service = service
+
+    reader = provider.search_rd("abc", "album")
+
+    assert [a.identifier for a in reader.read_range(0, 2)] == ["MPRE1", "MPRE2"]
+    assert service.calls == [("abc", YtmusicType.al, None)]
+
+    assert [a.identifier for a in reader] == ["MPRE3"]
+    assert service.calls[1:] == [("abc", YtmusicType.al, "1")]
+    assert reader.count == 3
@@ -8,14 +8,25 @@ from fuo_ytmusic.provider import YtmusicProvider
 FIXTURES_DIR = Path(__file__).parent / "fixtures"
 
 
-def _build_provider_with_home_sections(sections, expected_limit=None):
+def _build_provider_with_home_sections(sections, page_size=None):
+    """Serve the sections as home pages of page_size sections each."""
     provider = YtmusicProvider()
-    expected_limit = expected_limit or provider.HOME_SECTION_LIMIT
+    page_size = page_size or max(len(sections), 1)
+    pages = [sections[i : i + page_size] for i in range(0, len(sections), page_size)]
 
     class _ServiceStub:
-        def home_sections(self, limit=expected_limit):
-            assert limit == expected_limit
-            return sections
+        def __init__(self):
+            self.pages = pages or [[]]
+            self.calls = []
+
+        def home_page(self, continuation=None):
+            self.calls.append(continuation)
+            index = 0 if continuation is None else int(continuation)
+            has_next = index + 1 < len(self.pages)
+            return self.pages[index], str(index + 1) if has_next else None
+
+        def account_key(self):
+            return ""
 
     provider.service = _ServiceStub()
     return provider
@@ -27,7 +38,7 @@ def _load_fixture(name):
 
 def test_rec_list_collections_from_real_get_home_fixture():
     sections = _load_fixture("get_home.json")
-    provider = _build_provider_with_home_sections(sections, expected_limit=8)
+    provider = _build_provider_with_home_sections(sections, page_size=3)
 
     collections = provider.rec_list_collections(limit=8)
 
@@ -277,9 +288,12 @@ def test_rec_list_daily_returns_empty_when_home_sections_failed():
     provider = YtmusicProvider()
 
     class _ServiceStub:
-        def home_sections(self, limit=6):
+        def home_page(self, continuation=None):
             raise RuntimeError("boom")
 
+        def account_key(self):
+            return ""
+
     provider.service = _ServiceStub()
 
     assert provider.rec_list_daily_songs() == []
@@ -289,13 +303,78 @@ def test_rec_list_daily_returns_empty_when_home_sections_failed():
 def test_rec_list_collections_supports_limit_parameter():
     sections = [
         {
-            "title": "Quick picks",
-            "contents": [{"title": "Song A", "videoId": "vid-a"}],
+            "title": f"Section {i}",
+            "contents": [{"title": f"Song {i}", "videoId": f"vid-{i}"}],
         }
+        for i in range(5)
     ]
-    provider = _build_provider_with_home_sections(sections, expected_limit=3)
+    provider = _build_provider_with_home_sections(sections, page_size=2)
 
     collections = provider.rec_list_collections(limit=3)
 
-    assert len(collections) == 1
+    assert [c.name for c in collections] == ["Section 0", "Section 1", "Section 2"]
     assert collections[0].type_ == CollectionType.only_songs
+    # The last page is not requested.
+    assert provider.service.calls == [None, "1"]
+
+
+def test_rec_list_collections_keeps_pages_read_before_a_failure():
+    sections = _load_fixture("get_home.json")
+    provider = _build_provider_with_home_sections(sections, page_size=2)
+    home_page = provider.service.home_page
+
+    def failing_home_page(continuation=None):
+        if continuation is not None:
+            raise RuntimeError("continuation expired")
+        return home_page(continuation)
+
+    provider.service.home_page = failing_home_page
+
+    collections = provider.rec_list_collections()
+
+    builder = provider._home_recommendation_builder
+    expected = builder.build_collections(sections[:2])
+    assert [c.name for c in collections] == [c.name for c in expected]
+
+
+def test_rec_collections_rd_builds_collections_page_by_page():
+    sections = _load_fixture("get_home.json")
+    provider = _build_provider_with_home_sections(sections, page_size=2)
+    reader = provider.rec_collections_rd()
+
+    first = reader.read_range(0, 1)
+    assert len(first) == 1
+    assert provider.service.calls == [None]
+
+    rest = list(reader)
+    assert provider.service.calls[-1] is not None
+    builder = provider._home_recommendation_builder
+    expected = builder.build_collections(sections)
+    assert [c.name for c in first + rest] == [c.name for c in expected]
+
+
+def test_rec_list_collections_reuses_collections_of_cached_pages():
+    sections = _load_fixture("get_home.json")
+    provider = _build_provider_with_home_sections(sections)
+    builder = provider._home_recommendation_builder
+    builds = []
+    build_section_collections = builder.build_section_collections
+
+    def counting_build_section_collections(section):
+        builds.append(section)
+        return build_section_collections(section)
+
+    builder.build_section_collections = counting_build_section_collections
+
+    collections = provider.rec_list_collections()
+    assert provider.rec_list_daily_songs()
+    assert provider.rec_list_daily_playlists()
+    assert [c.name for c in list(provider.rec_collections_rd())] == [
+        c.name for c in collections
+    ]
+    assert len(builds) == len(sections)
+
+    # A refreshed page is a new object, its collections are rebuilt.
+    provider.service.pages = [sections[:1]]
+    assert len(provider.rec_list_collections()) < len(collections)
+    assert len(builds) == len(sections) + 1
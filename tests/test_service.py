@@ -1,16 +1,23 @@
+import json
 import logging
+import threading
+from pathlib import Path
+from types import SimpleNamespace
 
 from feeluown.library import SearchType
 
 from fuo_ytmusic import service
 from fuo_ytmusic.models import YtmusicSearchAlbum, YtmusicSearchSong
 
+FIXTURES_DIR = Path(__file__).parent / "fixtures"
+
 
 class TestService:
     def setup_method(self):
         service.logger.addHandler(logging.StreamHandler())
         service.logger.setLevel(logging.DEBUG)
         self.service = service.YtmusicService()
+        self.service.search.cache_clear()
 
     def teardown_method(self):
         del self.service
@@ -76,6 +83,23 @@ class TestService:
         assert isinstance(result, list)
         assert all(isinstance(r, YtmusicSearchAlbum) for r in result)
 
+    def test_search_results_are_cached_until_language_changes(self):
+        api = _StubApi([])
+        self.service._api = api
+        language = self.service._language
+
+        self.service.search("21 Guns", service.YtmusicType.so)
+        self.service.search("21 Guns", service.YtmusicType.so)
+        self.service.search("21 Guns", service.YtmusicType.al)
+        assert api.calls == 2
+
+        try:
+            self.service.setup_language("en")
+            self.service.search("21 Guns", service.YtmusicType.so)
+        finally:
+            self.service.setup_language(language)
+        assert api.calls == 3
+
     def test_get_charts_returns_raw_dict(self):
         self.service.get_charts.cache_clear()
         self.service._api = _ChartsApi(payload={"videos": []})
@@ -88,18 +112,160 @@ class TestService:
 
         assert self.service.get_charts("ZZ") == {}
 
+    def test_cache_keeps_several_entries_per_method(self):
+        self.service.get_charts.cache_clear()
+        api = _ChartsApi(payload={"videos": []})
+        self.service._api = api
+
+        self.service.get_charts("ZZ")
+        self.service.get_charts("US")
+        self.service.get_charts("ZZ")
+
+        assert api.calls == ["ZZ", "US"]
+        assert self.service.cache_stats()["get_charts"]["hits"] >= 1
+
+    def test_cache_is_scoped_by_profile(self):
+        self.service.get_charts.cache_clear()
+        api = _ChartsApi(payload={"videos": []})
+        self.service._api = api
+
+        self.service.get_charts("ZZ")
+        api.context = {"context": {"user": {"onBehalfOfUser": "gaia-1"}}}
+        self.service.get_charts("ZZ")
+
+        assert api.calls == ["ZZ", "ZZ"]
+
+    def test_check_stream_url_reports_forbidden_url(self, monkeypatch):
+        forbidden = []
+        monkeypatch.setattr(
+            self.service._session,
+            "head",
+            lambda url, **_: SimpleNamespace(status_code=403 if "bad" in url else 200),
+        )
+        self.service.stream_url_forbidden.connect(forbidden.append, weak=False)
+        try:
+            assert self.service.check_stream_url("https://x/good") is True
+            assert self.service.check_stream_url("https://x/bad") is False
+        finally:
+            self.service.stream_url_forbidden.disconnect(forbidden.append)
+
+        assert forbidden == ["https://x/bad"]
+
+    def test_artist_page_fetches_sections_concurrently(self):
+        for method in ("artist_info", "artist_albums", "playlist_info"):
+            getattr(self.service, method).cache_clear()
+        self.service._api = _ArtistApi()
+
+        page = self.service.artist_page("UC-artist")
+
+        assert page.info.name == "Artist"
+        assert [t.videoId for t in page.songs.tracks] == ["VID1"]
+        assert [a.browseId for a in page.albums] == ["MPRE-albums"]
+        assert [a.browseId for a in page.singles] == ["MPRE-singles"]
+
+    def test_artist_page_skips_songs_when_not_requested(self):
+        for method in ("artist_info", "artist_albums", "playlist_info"):
+            getattr(self.service, method).cache_clear()
+        api = _ArtistApi(parties=2)
+        api.get_playlist = None  # fail if the songs playlist is fetched
+        self.service._api = api
+
+        page = self.service.artist_page("UC-artist", songs=False)
+
+        assert page.songs is None
+        assert [a.browseId for a in page.albums] == ["MPRE-albums"]
+
+    def test_artist_page_only_waits_for_requested_sections(self):
+        for method in ("artist_info", "artist_albums", "playlist_info"):
+            getattr(self.service, method).cache_clear()
+        api = _ArtistApi(parties=1)
+        api.get_artist_albums = None  # fail if albums or singles are fetched
+        self.service._api = api
+
+        page = self.service.artist_page("UC-artist", albums=False, singles=False)
+
+        assert [t.videoId for t in page.songs.tracks] == ["VID1"]
+        assert page.albums is None
+        assert page.singles is None
+
 
 class _StubApi:
     def __init__(self, payload):
         self._payload = payload
+        self.calls = 0
 
     def search(self, *_args, **_kwargs):
+        self.calls += 1
         return list(self._payload)
 
 
 class _ChartsApi:
     def __init__(self, payload):
         self.payload = payload
+        self.calls = []
 
-    def get_charts(self, *_args, **_kwargs):
+    def get_charts(self, country, *_args, **_kwargs):
+        self.calls.append(country)
         return self.payload
+
+
+class _ArtistApi:
+    def __init__(self, parties=3):
+        # Each follow-up request blocks until all of them are running.
+        self._barrier = threading.Barrier(parties, timeout=5)
+
+    def get_artist(self, channel_id):
+        return {
+            "name": "Artist",
+            "channelId": channel_id,
+            "songs": {"browseId": "VLPL-songs", "results": []},
+            "albums": {"browseId": "UC-albums", "params": "p1", "results": []},
+            "singles": {"browseId": "UC-singles", "params": "p2", "results": []},
+        }
+
+    def get_playlist(self, playlist_id, limit):
+        self._barrier.wait()
+        return {"id": playlist_id, "tracks": [{"videoId": "VID1"}]}
+
+    def get_artist_albums(self, browse_id, params):
+        self._barrier.wait()
+        name = browse_id.split("-")[1]
+        return [{"browseId": f"MPRE-{name}"}]
+
+
+def _search_api(payload):
+    api = service.YTMusic.__new__(service.YTMusic)
+    api._send_request = lambda endpoint, body, additional_params="": payload
+    return api
+
+
+def test_search_page_skips_shelves_of_another_category():
+    payload = json.loads(
+        (FIXTURES_DIR / "search_featured_playlists.json").read_text(encoding="utf-8")
+    )
+
+    items, continuation = _search_api(payload).search_page(
+        "chill", "featured_playlists"
+    )
+
+    assert [item["browseId"] for item in items] == [
+        "VLRDCLAK5uy_chill",
+        "VLRDCLAK5uy_focus",
+    ]
+    assert {item["category"] for item in items} == {"Featured playlists"}
+    assert continuation == "&ctoken=CTOKEN&continuation=CTOKEN"
+
+
+def test_search_page_falls_back_to_first_shelf_for_localized_titles():
+    payload = json.loads(
+        (FIXTURES_DIR / "search_featured_playlists.json").read_text(encoding="utf-8")
+    )
+    sections = payload["contents"]["tabbedSearchResultsRenderer"]["tabs"][0][
+        "tabRenderer"
+    ]["content"]["sectionListRenderer"]["contents"]
+    for section in sections[1:]:
+        section["musicShelfRenderer"]["title"]["runs"][0]["text"] = "精选歌单"
+
+    items, _ = _search_api(payload).search_page("chill", "featured_playlists")
+
+    assert items[0]["title"] == "Padding Song"
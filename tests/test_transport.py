@@ -0,0 +1,153 @@
+import gzip
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+import requests
+
+from fuo_ytmusic.transport import YtmusicHTTPAdapter, YtmusicSession, endpoint_name
+
+
+class _OkHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        body = b"ok"
+        self.send_response(200)
+        if self.path == "/youtubei/v1/browse":
+            body = gzip.compress(b"x" * 1000)
+            self.send_header("Content-Encoding", "gzip")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def http_server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _OkHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+def test_session_picks_adapter_by_host_suffix():
+    session = YtmusicSession()
+
+    music = session.get_adapter("https://music.youtube.com/youtubei/v1/browse")
+    video = session.get_adapter("https://rr1---sn-abc.googlevideo.com/videoplayback")
+    upload = session.get_adapter("https://upload.youtube.com/upload/usermusic/http")
+    other = session.get_adapter("https://www.youtube.com/")
+
+    assert music.stats()["pool_maxsize"] == 16
+    assert video.stats()["pool_maxsize"] == 4
+    assert upload.stats()["max_retries"] == 0
+    assert other not in (music, video, upload)
+
+    session.configure_host("music.youtube.com", pool_maxsize=4)
+    assert session.pool_stats()["music.youtube.com"]["pool_maxsize"] == 4
+
+
+class _FlakyHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    posts = 0
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        type(self).posts += 1
+        status, body = (503, b"busy") if type(self).posts == 1 else (200, b"ok")
+        self.send_response(status)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.mark.parametrize(
+    "endpoint, posts, status",
+    [("browse", 2, 200), ("playlist/create", 1, 503), ("browse/edit_playlist", 1, 503)],
+)
+def test_innertube_post_is_only_retried_for_read_endpoints(endpoint, posts, status):
+    _FlakyHandler.posts = 0
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _FlakyHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    url = f"http://127.0.0.1:{server.server_address[1]}"
+    try:
+        adapter = YtmusicSession().get_adapter("https://music.youtube.com/")
+        session = requests.Session()
+        session.mount(url, adapter)
+
+        response = session.post(f"{url}/youtubei/v1/{endpoint}?alt=json", json={})
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    assert response.status_code == status
+    assert _FlakyHandler.posts == posts
+
+
+def test_adapter_reaps_idle_pools(http_server, clock):
+    adapter = YtmusicHTTPAdapter(pool_maxsize=2, max_idle=60, timer=clock)
+    session = requests.Session()
+    session.mount(http_server, adapter)
+
+    assert session.get(http_server).text == "ok"
+    assert session.get(http_server).text == "ok"
+    (pool,) = adapter.stats()["pools"]
+    # Keep-alive: both requests went over one connection.
+    assert pool["connections"] == 1
+    assert pool["requests"] == 2
+    assert pool["idle"] == 1
+
+    clock.now = 30
+    assert adapter.reap_idle() == 0
+    clock.now = 120
+    assert adapter.reap_idle() == 1
+    assert adapter.stats()["pools"] == []
+    assert adapter.stats()["reaped"] == 1
+
+    # A new pool is created on demand.
+    assert session.get(http_server).text == "ok"
+    assert len(adapter.stats()["pools"]) == 1
+
+
+def test_endpoint_name():
+    assert endpoint_name("https://music.youtube.com/youtubei/v1/browse?ctoken=x") == (
+        "browse"
+    )
+    assert endpoint_name("https://music.youtube.com/youtubei/v1/music/get_queue") == (
+        "music/get_queue"
+    )
+    assert endpoint_name("https://rr1---sn-a.googlevideo.com/videoplayback?id=1") == (
+        "rr1---sn-a.googlevideo.com"
+    )
+
+
+def test_session_records_sizes_and_timings(http_server):
+    session = YtmusicSession()
+    records = []
+    session.observers.append(records.append)
+
+    response = session.get(http_server + "/youtubei/v1/browse")
+
+    assert response.content == b"x" * 1000
+    (record,) = records
+    assert record.endpoint == "browse"
+    assert record.status == 200
+    assert record.content_encoding == "gzip"
+    assert record.body_bytes == 1000
+    assert 0 < record.wire_bytes < record.body_bytes
+    assert 0 <= record.ttfb <= record.latency
+
+    # A streamed body is not read just to measure it.
+    response = session.get(http_server, stream=True)
+    assert records[-1].body_bytes is None
+    assert not response._content_consumed
+    response.close()
@@ -0,0 +1,75 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+
+import pytest
+
+from fuo_ytmusic.typeahead import YtmusicTypeahead
+
+
+class _Fetcher:
+    def __init__(self):
+        self.queries = []
+        self.release = threading.Event()
+        self.release.set()
+
+    def __call__(self, query):
+        self.queries.append(query)
+        assert self.release.wait(timeout=5)
+        return [
+            SimpleNamespace(title="Radiohead Creep"),
+            SimpleNamespace(title="Radio Ga Ga"),
+        ]
+
+
+@pytest.fixture
+def executor():
+    executor = ThreadPoolExecutor(max_workers=2)
+    yield executor
+    executor.shutdown(wait=True)
+
+
+def _typeahead(fetcher, executor, delay=0.05):
+    return YtmusicTypeahead(
+        fetcher, lambda: executor, text_of=lambda item: item.title, delay=delay
+    )
+
+
+def test_keystrokes_are_debounced(executor):
+    fetcher = _Fetcher()
+    typeahead = _typeahead(fetcher, executor)
+
+    superseded = [typeahead.query(text) for text in ("r", "ra", "rad")]
+    result = typeahead.query("Radio ").result(timeout=5)
+
+    assert all(future.cancelled() for future in superseded)
+    assert fetcher.queries == ["radio"]
+    assert len(result) == 2
+    # Served from cache, the normalized query is the same.
+    assert typeahead.query("  RADIO").result(timeout=5) == result
+    assert fetcher.queries == ["radio"]
+
+
+def test_identical_queries_share_one_fetch(executor):
+    fetcher = _Fetcher()
+    fetcher.release.clear()
+    typeahead = _typeahead(fetcher, executor, delay=0)
+
+    first = typeahead.query("radio")
+    while not fetcher.queries:
+        threading.Event().wait(0.01)
+    second = typeahead.query("radio")
+    fetcher.release.set()
+
+    assert first.result(timeout=5) == second.result(timeout=5)
+    assert fetcher.queries == ["radio"]
+
+
+def test_refine_filters_cached_prefix(executor):
+    typeahead = _typeahead(_Fetcher(), executor, delay=0)
+
+    assert typeahead.refine("radioh") is None
+    typeahead.query("radio").result(timeout=5)
+
+    refined = typeahead.refine("radioh")
+    assert [item.title for item in refined] == ["Radiohead Creep"]
@@ -0,0 +1,83 @@
+import os
+
+import pytest
+
+from fuo_ytmusic.ytdlp_pool import YtdlpExtractorPool
+
+
+class _Extractor:
+    def __init__(self, opts):
+        self.opts = opts
+        self.closed = False
+
+    def close(self):
+        self.closed = True
+
+
+def test_pool_reuses_extractor_for_same_opts():
+    created = []
+
+    def _factory(opts):
+        created.append(_Extractor(opts))
+        return created[-1]
+
+    pool = YtdlpExtractorPool(_factory)
+
+    with pool.extractor({"proxy": "http://p"}) as first:
+        pass
+    with pool.extractor({"proxy": "http://p"}) as second:
+        pass
+    with pool.extractor({"proxy": "http://other"}):
+        pass
+
+    assert first is second
+    assert len(created) == 2
+
+
+def test_pool_lends_an_extractor_to_one_caller_at_a_time():
+    pool = YtdlpExtractorPool(_Extractor)
+
+    with pool.extractor({}) as first:
+        with pool.extractor({}) as second:
+            assert first is not second
+    assert pool.idle_count() == 2
+
+
+def test_pool_discards_extractor_after_error():
+    pool = YtdlpExtractorPool(_Extractor)
+
+    with pytest.raises(RuntimeError):
+        with pool.extractor({}) as ydl:
+            raise RuntimeError("boom")
+
+    assert ydl.closed
+    assert pool.idle_count() == 0
+
+
+def test_pool_clear_closes_idle_and_in_use_extractors():
+    pool = YtdlpExtractorPool(_Extractor)
+    with pool.extractor({}) as idle:
+        pass
+
+    with pool.extractor({}) as in_use:
+        pool.clear()
+
+    assert idle.closed
+    assert in_use.closed
+    assert pool.idle_count() == 0
+
+
+def test_pool_rebuilds_extractor_when_cookiefile_changes(tmp_path):
+    cookiefile = tmp_path / "ytmusic.cookies.txt"
+    cookiefile.write_text("# v1", encoding="utf-8")
+    pool = YtdlpExtractorPool(_Extractor)
+    opts = {"cookiefile": str(cookiefile)}
+
+    with pool.extractor(opts) as first:
+        pass
+    stat = os.stat(cookiefile)
+    os.utime(cookiefile, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    with pool.extractor(opts) as second:
+        pass
+
+    assert first is not second